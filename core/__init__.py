@@ -4,7 +4,8 @@ Core framework components for the quantitative trading scheduler.
 
 from .base import AbstractService, AbstractStrategy, AbstractTask
 from .message_bus import MessageBus
-from .constants import Topics, Ports
+from .constants import Topics, Ports, TaskPriority
+from .task_scheduler import PriorityTaskScheduler, get_task_scheduler
 
 __all__ = [
     'AbstractService',
@@ -12,5 +13,8 @@ __all__ = [
     'AbstractTask',
     'MessageBus',
     'Topics',
-    'Ports'
+    'Ports',
+    'TaskPriority',
+    'PriorityTaskScheduler',
+    'get_task_scheduler'
 ]
\ No newline at end of file
@@ -9,15 +9,139 @@ Design decisions:
 """
 
 import asyncio
+import copy
+import logging
+import multiprocessing
+import os
+import time
 import json
-from abc import ABC, abstractmethod
-from typing import Dict, Any, TYPE_CHECKING
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, TYPE_CHECKING
+
+from .message_bus import MessageBus
+from .constants import Topics, Ports, TaskPriority
+from .task_scheduler import get_task_scheduler
 
 if TYPE_CHECKING:
     from utils.log_utils import LogUtils
 
 
-class AbstractService(ABC):
+# One logger for all tasks; task_id travels as a record attribute
+_TASK_LOGGER = logging.getLogger("task")
+
+# Shared pool for CPU-bound work; services stay on the event loop.
+# Shut down once the last service that used it cleans up.
+_CPU_EXECUTOR: Optional[ProcessPoolExecutor] = None
+_CPU_EXECUTOR_USERS: Set["AbstractService"] = set()
+
+
+def _get_cpu_executor(user: "AbstractService") -> ProcessPoolExecutor:
+    global _CPU_EXECUTOR
+    if _CPU_EXECUTOR is None:
+        # By first use the process already runs libzmq I/O threads and the
+        # log listener/console threads; forking a threaded process is unsafe
+        methods = multiprocessing.get_all_start_methods()
+        start_method = "forkserver" if "forkserver" in methods else "spawn"
+        _CPU_EXECUTOR = ProcessPoolExecutor(
+            max_workers=os.cpu_count(),
+            mp_context=multiprocessing.get_context(start_method),
+        )
+    _CPU_EXECUTOR_USERS.add(user)
+    return _CPU_EXECUTOR
+
+
+async def _release_cpu_executor(user: "AbstractService"):
+    global _CPU_EXECUTOR
+    _CPU_EXECUTOR_USERS.discard(user)
+    if _CPU_EXECUTOR is None or _CPU_EXECUTOR_USERS:
+        return
+    executor, _CPU_EXECUTOR = _CPU_EXECUTOR, None
+    # shutdown(wait=True) joins the workers; keep that off the event loop
+    await asyncio.to_thread(executor.shutdown, True, cancel_futures=True)
+
+
+def _require_overrides(cls, base, *names: str):
+    """
+    Fail at class creation if cls does not override the named hooks.
+
+    Replaces ABCMeta so instantiation skips abstract-method bookkeeping;
+    pass abstract=True in the class statement for intermediate bases.
+    """
+    missing = [name for name in names if getattr(cls, name) is getattr(base, name)]
+    if missing:
+        raise TypeError(f"{cls.__name__} must implement {', '.join(missing)}()")
+
+
+# Queued after the last row so the flusher pushes what it holds, then exits
+_CLOSE_OUTBOX = object()
+
+
+class _TaskResultOutbox:
+    """
+    Batch task result rows into one PUSH frame per flush.
+
+    A strategy owns one outbox shared by all of its tasks, so a batch can
+    span tasks; rows are (task_id, timestamp, kind, payload) and the
+    strategy_id is sent once per frame.
+    """
+
+    def __init__(
+        self, message_bus: MessageBus, strategy_id: str, batch_max: int, batch_wait: float
+    ):
+        self.message_bus = message_bus
+        self.strategy_id = strategy_id
+        self.batch_max = batch_max
+        self.batch_wait = batch_wait
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._flusher: Optional[asyncio.Task] = None
+
+    def put(self, row: Tuple[str, float, str, Any]):
+        self._queue.put_nowait(row)
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._flush_loop())
+
+    def _drain(self, batch: List[Tuple[str, float, str, Any]]) -> bool:
+        """Move queued rows into batch; returns True once the close marker is reached."""
+        while len(batch) < self.batch_max and not self._queue.empty():
+            row = self._queue.get_nowait()
+            if row is _CLOSE_OUTBOX:
+                return True
+            batch.append(row)
+        return False
+
+    async def _push(self, rows: List[Tuple[str, float, str, Any]]):
+        await self.message_bus.push_rows(
+            rows, Ports.TASK_RESULTS, strategy_id=self.strategy_id
+        )
+
+    async def _flush_loop(self):
+        """Collect up to batch_max rows (or wait batch_wait) per PUSH until closed."""
+        closing = False
+        while not closing:
+            row = await self._queue.get()
+            if row is _CLOSE_OUTBOX:
+                return
+            batch = [row]
+            closing = self._drain(batch)
+            if not closing and len(batch) < self.batch_max and self.batch_wait > 0:
+                await asyncio.sleep(self.batch_wait)
+                closing = self._drain(batch)
+            await self._push(batch)
+
+    async def close(self):
+        """Push every queued row, including a batch the flusher is holding."""
+        if self._flusher is not None and not self._flusher.done():
+            self._queue.put_nowait(_CLOSE_OUTBOX)
+            await asyncio.gather(self._flusher, return_exceptions=True)
+        # Rows left behind only if the flusher died; send them directly
+        while not self._queue.empty():
+            batch: List[Tuple[str, float, str, Any]] = []
+            self._drain(batch)
+            if batch:
+                await self._push(batch)
+
+
+class AbstractService:
     """
     Base class for all services in the system.
 
@@ -26,6 +150,11 @@ class AbstractService(ABC):
     simplicity for development and debugging.
     """
 
+    def __init_subclass__(cls, abstract: bool = False, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if not abstract:
+            _require_overrides(cls, AbstractService, "async_run")
+
     def __init__(self, name: str, config: Dict[str, Any]):
         self.name = name
         self.config = config
@@ -45,7 +174,6 @@ class AbstractService(ABC):
             await self.cleanup()
             self.shutdown()
 
-    @abstractmethod
     async def async_run(self):
         """
         Main async service loop.
@@ -75,7 +203,7 @@ class AbstractService(ABC):
 
         Called when the service is shutting down.
         """
-        pass
+        await _release_cpu_executor(self)
 
     async def _handle_exception(self, exception: Exception):
         """
@@ -98,6 +226,16 @@ class AbstractService(ABC):
         """
         self._log_service.log_message(self.name, level, message)
 
+    async def run_cpu(self, fn: Callable[..., Any], *args) -> Any:
+        """
+        Run a CPU-bound function in the shared process pool.
+
+        Keeps heavy computation off the event loop. fn and args must be
+        picklable (module-level function, plain data).
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_get_cpu_executor(self), fn, *args)
+
     def shutdown(self):
         """Signal the service to shutdown gracefully."""
         self._running = False
@@ -112,6 +250,11 @@ class AbstractStrategy(AbstractService):
     periodic step() execution and task spawning.
     """
 
+    def __init_subclass__(cls, abstract: bool = False, **kwargs):
+        super().__init_subclass__(abstract=abstract, **kwargs)
+        if not abstract:
+            _require_overrides(cls, AbstractStrategy, "step")
+
     def __init__(self, strategy_id: str, config: Dict[str, Any]):
         super().__init__(f"strategy_{strategy_id}", config)
         self.strategy_id = strategy_id
@@ -119,20 +262,70 @@ class AbstractStrategy(AbstractService):
         self.step_interval = (
             config.get("step_interval_minutes", 5) * 60
         )  # Convert to seconds
+        self.message_bus = MessageBus(self.name, config.get("message_bus"))
+        self._step_trigger = asyncio.Event()
+
+        # State snapshots are queued and sent to StateManagementService in batches
+        self.state_flush_interval = config.get("state_flush_interval_ms", 1000) / 1000
+        self._state_outbox: asyncio.Queue = asyncio.Queue()
+        self._state_flush_task: Optional[asyncio.Task] = None
+        self._state_flush_stop = asyncio.Event()
+
+        # Results of all tasks spawned by this strategy go out on its own bus
+        self._task_results = _TaskResultOutbox(
+            self.message_bus,
+            strategy_id,
+            batch_max=config.get("result_batch_max", 64),
+            batch_wait=config.get("result_batch_wait_ms", 5) / 1000,
+        )
 
     async def async_run(self):
         """
         Main strategy loop.
 
-        Subscribes to GLOBAL_STEP events and executes step() according to configured interval.
+        Subscribes to GLOBAL_STEP events and executes step() each time the
+        scheduler publishes one. The loop sleeps on an event between steps
+        instead of polling.
         """
         await self.load_state()
+        self._state_flush_task = asyncio.create_task(self._state_flush_loop())
+
+        self.message_bus.register_handler(Topics.GLOBAL_STEP, self._on_global_step)
+        subscription = asyncio.create_task(
+            self.message_bus.subscribe_loop(Ports.GLOBAL_EVENTS, [Topics.GLOBAL_STEP])
+        )
+
+        try:
+            while self._running:
+                await self._step_trigger.wait()
+                self._step_trigger.clear()
+                if not self._running:
+                    break
+                await self.step()
+        finally:
+            subscription.cancel()
+
+    async def _on_global_step(self, message: Dict[str, Any]):
+        """Wake the strategy loop for the next step."""
+        self._step_trigger.set()
+
+    async def cleanup(self):
+        """Flush pending state snapshots and release the strategy's message bus."""
+        await super().cleanup()
+        # Stop rather than cancel the flush loop, so a batch it is sending is not lost
+        self._state_flush_stop.set()
+        if self._state_flush_task and not self._state_flush_task.done():
+            await asyncio.gather(self._state_flush_task, return_exceptions=True)
+        await self._flush_state_outbox()
+        await get_task_scheduler(self.config).cancel_group(self.strategy_id)
+        await self._task_results.close()
+        await self.message_bus.cleanup()
 
-        while self._running:
-            await self.step()
-            await asyncio.sleep(self.step_interval)
+    def shutdown(self):
+        """Signal shutdown and wake the strategy loop if it is waiting."""
+        super().shutdown()
+        self._step_trigger.set()
 
-    @abstractmethod
     async def step(self):
         """
         Execute one strategy step.
@@ -157,26 +350,62 @@ class AbstractStrategy(AbstractService):
             self.state = {}
 
     async def save_state(self):
-        """Save strategy state to StateManagementService."""
+        """
+        Queue a snapshot of the strategy state for StateManagementService.
+
+        Snapshots are sent in batches by the state flush loop, so saving
+        never waits on a REQ round-trip or a database write.
+        """
         try:
-            # TODO: Send REQ to StateManagementService to save state
-            pass
+            self._state_outbox.put_nowait(copy.deepcopy(self.state))
         except Exception as e:
             await self._handle_exception(e)
 
-    def spawn_task(self, task_class, task_params: Dict[str, Any]):
+    async def _state_flush_loop(self):
+        """Send queued state snapshots every state_flush_interval seconds until stopped."""
+        while not self._state_flush_stop.is_set():
+            try:
+                await asyncio.wait_for(self._state_flush_stop.wait(), self.state_flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            await self._flush_state_outbox()
+
+    async def _flush_state_outbox(self):
+        if self._state_outbox.empty():
+            return
+        batch = []
+        while not self._state_outbox.empty():
+            batch.append(
+                {"strategy_id": self.strategy_id, "state_dict": self._state_outbox.get_nowait()}
+            )
+        response = await self.message_bus.request(
+            {"operation": "save_states", "params": {"batch": batch}},
+            Ports.STATE_MANAGEMENT,
+        )
+        if not response or not response.get("success"):
+            self.log("ERROR", f"Failed to save {len(batch)} state snapshot(s): {response}")
+
+    def spawn_task(
+        self,
+        task_class,
+        task_params: Dict[str, Any],
+        priority: int = TaskPriority.LOW,
+        weight: int = 1,
+    ):
         """
         Spawn a new task with independent scheduling.
 
-        Tasks run asynchronously and report results via ZeroMQ PUSH.
+        Tasks are queued on the shared PriorityTaskScheduler, grouped by
+        strategy, and report results through the strategy's result outbox.
         """
-        # TODO: Create task instance and run it
-        # task = task_class(self.strategy_id, task_params, self.config)
-        # asyncio.create_task(task.run())
-        pass
+        task = task_class(self.strategy_id, task_params, self.config)
+        task._results = self._task_results
+        return get_task_scheduler(self.config).submit(
+            task, priority=priority, group=self.strategy_id, weight=weight
+        )
 
 
-class AbstractTask(ABC):
+class AbstractTask:
     """
     Base class for trading tasks.
 
@@ -184,6 +413,11 @@ class AbstractTask(ABC):
     They have their own scheduling and report results asynchronously.
     """
 
+    def __init_subclass__(cls, abstract: bool = False, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if not abstract:
+            _require_overrides(cls, AbstractTask, "execute")
+
     def __init__(
         self, strategy_id: str, params: Dict[str, Any], config: Dict[str, Any]
     ):
@@ -191,6 +425,12 @@ class AbstractTask(ABC):
         self.params = params
         self.config = config
         self.task_id = f"{strategy_id}_{self.__class__.__name__}_{id(self)}"
+        self.logger = logging.LoggerAdapter(_TASK_LOGGER, {"task_id": self.task_id})
+
+        # Set by spawn_task to the owning strategy's outbox; a task run on
+        # its own creates a private outbox (and socket) on first send
+        self._results: Optional[_TaskResultOutbox] = None
+        self._owns_results = False
 
     async def run(self):
         """
@@ -210,8 +450,9 @@ class AbstractTask(ABC):
 
         except Exception as e:
             await self.send_error(str(e))
+        finally:
+            await self.close()
 
-    @abstractmethod
     async def execute(self) -> Dict[str, Any]:
         """
         Execute the core task logic.
@@ -222,25 +463,28 @@ class AbstractTask(ABC):
         pass
 
     async def send_result(self, result: Dict[str, Any]):
-        """Send task result to DataAnalyticsService via ZeroMQ PUSH."""
-        result_data = {
-            "task_id": self.task_id,
-            "strategy_id": self.strategy_id,
-            "timestamp": asyncio.get_event_loop().time(),
-            "result": result,
-        }
-
-        # TODO: Send via ZeroMQ PUSH to TASK_RESULTS
-        pass
+        """Queue task result for batched delivery to DataAnalyticsService."""
+        self._result_outbox().put((self.task_id, time.monotonic(), "result", result))
 
     async def send_error(self, error_message: str):
-        """Send task error to DataAnalyticsService."""
-        error_data = {
-            "task_id": self.task_id,
-            "strategy_id": self.strategy_id,
-            "timestamp": asyncio.get_event_loop().time(),
-            "error": error_message,
-        }
-
-        # TODO: Send via ZeroMQ PUSH to TASK_RESULTS
-        pass
+        """Queue task error for batched delivery to DataAnalyticsService."""
+        self._result_outbox().put((self.task_id, time.monotonic(), "error", error_message))
+
+    def _result_outbox(self) -> _TaskResultOutbox:
+        if self._results is None:
+            self._results = _TaskResultOutbox(
+                MessageBus(self.task_id, self.config.get("message_bus")),
+                self.strategy_id,
+                batch_max=self.params.get("result_batch_max", 64),
+                batch_wait=self.params.get("result_batch_wait_ms", 5) / 1000,
+            )
+            self._owns_results = True
+        return self._results
+
+    async def close(self):
+        """Flush queued results if this task owns its outbox; a strategy flushes its own."""
+        if self._owns_results:
+            await self._results.close()
+            await self._results.message_bus.cleanup()
+            self._results = None
+            self._owns_results = False
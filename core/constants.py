@@ -1,5 +1,5 @@
 """
-Constants for ZeroMQ topics and ports configuration.
+Constants for ZeroMQ topics, ports and task priorities.
 """
 
 
@@ -19,6 +19,24 @@ class Topics:
     SERVICE_START = "SERVICE_START"
     SERVICE_STOP = "SERVICE_STOP"
 
+    # Pre-encoded topic frames for ZeroMQ send/subscribe
+    GLOBAL_STEP_B = GLOBAL_STEP.encode()
+    MARKET_DATA_B = MARKET_DATA.encode()
+    REFLECTION_UPDATE_B = REFLECTION_UPDATE.encode()
+    DATA_PROCESSED_B = DATA_PROCESSED.encode()
+    TASK_RESULTS_B = TASK_RESULTS.encode()
+    SERVICE_START_B = SERVICE_START.encode()
+    SERVICE_STOP_B = SERVICE_STOP.encode()
+
+    @classmethod
+    def all_bytes(cls):
+        """Map every topic string to its pre-encoded bytes."""
+        return {
+            value: getattr(cls, f"{name}_B")
+            for name, value in vars(cls).items()
+            if isinstance(value, str) and hasattr(cls, f"{name}_B")
+        }
+
 
 class Ports:
     """Default ZeroMQ port configuration."""
@@ -42,3 +60,11 @@ class Ports:
             "TASK_RESULTS": cls.TASK_RESULTS,
             "STATE_MANAGEMENT": cls.STATE_MANAGEMENT,
         }
+
+
+class TaskPriority:
+    """Priority levels for spawned tasks (lower value runs first)."""
+
+    HIGH = 0
+    NORMAL = 5
+    LOW = 10
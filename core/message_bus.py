@@ -3,25 +3,27 @@ import json
 import logging
 import time
 import inspect
-import threading
-from dataclasses import dataclass, asdict
-from typing import Dict, Any, Optional, Callable, Set, List
+import math
+import uuid
+from dataclasses import dataclass, fields
+from typing import Dict, Any, Optional, Callable, Set, List, Tuple
 import zmq
 import zmq.asyncio
 
 from .constants import Topics, Ports
 
 
+class _NullLogUtils:
+    def log_message(self, *a, **kw):
+        pass
+
+
 try:
     from utils.log_utils import get_log_utils
 except Exception:
 
     def get_log_utils(_cfg=None):
-        class Dummy:
-            def log_message(self, *a, **kw):
-                pass
-
-        return Dummy()
+        return _NullLogUtils()
 
 
 # ===================== 默认配置 =====================
@@ -30,32 +32,64 @@ DEFAULT_CONFIG = {
     "hwm_inbound": 1000,  # PULL/REQ/REP 的接收高水位
     "pub_send_timeout": 1.0,  # PUB 发送超时（秒）
     "push_send_timeout": 1.0,  # PUSH 发送超时（秒）
-    "req_total_timeout": 5.0,  # REQ 总超时（发送+接收拆半）
-    "rep_recv_timeout": 30.0,  # REQ/REP 接收超时 (秒)
+    "req_total_timeout": 5.0,  # request 总超时（发送+等待回复拆半）
     "rep_send_timeout": 5.0,  # REQ/REP 响应发送超时 (秒)
     "failed_socket_cooldown": 10.0,  # 失败后多少秒后允许尝试重建
     "handler_max_concurrency": None,  # 限制订阅消息处理并发
+    "recv_batch_max": 32,  # 每次唤醒最多处理的消息数，处理完一批后让出事件循环
+    "recv_zero_copy": False,  # SUB/PULL 以 zmq.Frame 接收，payload 以 memoryview 直接反序列化（大消息时开启）
     "log_level_no_handler": "DEBUG",
-    "serializer": "json",  # 预留扩展点
+    "serializer": "orjson",  # orjson / json / msgpack（orjson 未安装时回退 json；json 同样把 NaN/Infinity 写为 null，两者可互通）
     "close_linger_ms": 100,  # 关闭时 linger 时间（毫秒）
+    "transport": "tcp",  # tcp / ipc / inproc（inproc 总是使用共享 Context）
+    "shared_context": True,  # 同进程的 MessageBus 共用一个 Context（一组 I/O 线程），最后一个 cleanup 时 term
+    "io_threads": 1,  # Context 的 I/O 线程数（共享 Context 以首个创建者的配置为准）
+    "ipc_dir": "/tmp",  # ipc socket 文件所在目录
+    "tcp_keepalive": True,  # TCP keepalive，及时发现断开的对端
+    "immediate": False,  # connect 端只向已完成握手的连接排队（开启后对端未就绪时不再缓冲）
+    "sndbuf": 0,  # 内核发送缓冲区字节数（SO_SNDBUF），0 为系统默认
+    "rcvbuf": 0,  # 内核接收缓冲区字节数（SO_RCVBUF），0 为系统默认
+    "pub_coalesce_ms": 0,  # >0 时 publish 按 (topic, port) 攒批，间隔到期后以 publish_batch 单帧发出
+    "pub_coalesce_max": 256,  # 攒批上限，达到后立即发出
+    "pub_skip_unsubscribed": True,  # 发布端用 XPUB 跟踪订阅，无人订阅的主题直接跳过序列化和发送
 }
 
 
 # ===================== 序列化器 =====================
 class Serializer:
-    def dumps(self, obj: Any) -> str:
+    """消息序列化接口：统一使用 bytes，直接对接 ZMQ 帧。"""
+
+    def dumps(self, obj: Any) -> bytes:
         raise NotImplementedError
 
-    def loads(self, s: str) -> Any:
+    def loads(self, b: bytes) -> Any:
         raise NotImplementedError
 
 
+def _nan_to_none(obj: Any) -> Any:
+    if isinstance(obj, float):
+        return obj if math.isfinite(obj) else None
+    if isinstance(obj, dict):
+        return {k: _nan_to_none(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_nan_to_none(v) for v in obj]
+    return obj
+
+
 class JsonSerializer(Serializer):
-    def dumps(self, obj: Any) -> str:
-        return json.dumps(obj, separators=(",", ":"))
+    def dumps(self, obj: Any) -> bytes:
+        # 与 orjson 一致：NaN/Infinity 输出为 null（json 默认输出 NaN，orjson.loads 无法解析）。
+        # 先按严格模式序列化，只有确实含 NaN/Infinity 时才复制一份替换后重试
+        try:
+            return json.dumps(obj, separators=(",", ":"), allow_nan=False).encode()
+        except ValueError:
+            return json.dumps(_nan_to_none(obj), separators=(",", ":"), allow_nan=False).encode()
 
-    def loads(self, s: str) -> Any:
-        return json.loads(s)
+    def loads(self, b: bytes) -> Any:
+        # json 不接受 memoryview（recv_zero_copy 时传入），需先转为 bytes
+        if isinstance(b, memoryview):
+            b = b.tobytes()
+        return json.loads(b)
 
 
 class OrjsonSerializer(Serializer):
@@ -63,23 +97,86 @@ class OrjsonSerializer(Serializer):
         import orjson
 
         self._orjson = orjson
+        # 与 json 一致：允许 int 等非 str 键（json 会转为字符串）
+        self._option = orjson.OPT_NON_STR_KEYS
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._orjson.dumps(obj, option=self._option)
+
+    def loads(self, b: bytes) -> Any:
+        return self._orjson.loads(b)
+
+
+class MsgpackSerializer(Serializer):
+    def __init__(self):
+        import msgpack
+
+        self._msgpack = msgpack
 
-    def dumps(self, obj: Any) -> str:
-        return self._orjson.dumps(obj).decode()
+    def dumps(self, obj: Any) -> bytes:
+        return self._msgpack.packb(obj, use_bin_type=True)
 
-    def loads(self, s: str) -> Any:
-        return self._orjson.loads(s)
+    def loads(self, b: bytes) -> Any:
+        return self._msgpack.unpackb(b, raw=False)
 
 
 def build_serializer(kind: str) -> Serializer:
+    # 可选依赖缺失时回退到标准库 json
     if kind == "orjson":
         try:
             return OrjsonSerializer()
         except Exception:
             pass
+    elif kind == "msgpack":
+        try:
+            return MsgpackSerializer()
+        except Exception:
+            pass
     return JsonSerializer()
 
 
+def _frame_view(frame: Any) -> Any:
+    """copy=True 时帧已是 bytes；copy=False 时返回 zmq.Frame 的 memoryview，避免再复制一次。"""
+    return frame if isinstance(frame, bytes) else frame.buffer
+
+
+# ===================== 共享 Context =====================
+# 每个 Context 都有自己的 I/O 线程；同进程的总线默认共用本模块私有的 Context，
+# 按引用计数在最后一个使用者释放时 term。不使用 Context.instance()：那是进程全局单例，
+# 其他代码可能仍在其上持有 socket，term 会一直阻塞到它们全部关闭
+_shared_context: Optional[zmq.asyncio.Context] = None
+_shared_context_refs = 0
+
+
+def _acquire_shared_context(io_threads: int) -> zmq.asyncio.Context:
+    global _shared_context, _shared_context_refs
+    if _shared_context is None:
+        _shared_context = zmq.asyncio.Context(io_threads=io_threads)
+    _shared_context_refs += 1
+    return _shared_context
+
+
+def _release_shared_context(ctx: zmq.asyncio.Context):
+    global _shared_context, _shared_context_refs
+    _shared_context_refs -= 1
+    if _shared_context_refs == 0:
+        # 下一个使用者会重新创建
+        _shared_context = None
+        ctx.term()
+
+
+# ===================== Topic 编码缓存 =====================
+# Topic 来自固定的 Topics 常量，预先载入其编码结果；自定义 topic 首次使用时再缓存
+_TOPIC_BYTES: Dict[str, bytes] = Topics.all_bytes()
+
+
+def _topic_bytes(topic: str) -> bytes:
+    b = _TOPIC_BYTES.get(topic)
+    if b is None:
+        b = _TOPIC_BYTES[topic] = topic.encode()
+    return b
+
+
 # ===================== Metrics =====================
 @dataclass
 class BusMetrics:
@@ -92,15 +189,22 @@ class BusMetrics:
     request_timeouts: int = 0
     failed_bind_count: int = 0
     active_connections: int = 0
+    publish_skipped: int = 0
 
     def as_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+        # 扁平计数器：直接取属性，避免 asdict 的递归 deepcopy
+        return {name: getattr(self, name) for name in _METRIC_FIELDS}
+
+
+_METRIC_FIELDS = tuple(f.name for f in fields(BusMetrics))
 
 
 # ===================== Socket 管理 =====================
 class SocketRegistry:
     """
     统一管理 socket 创建/缓存/关闭，避免重复代码。
+
+    只在所属事件循环内访问（zmq socket 本身也非线程安全），因此不加锁。
     """
 
     def __init__(
@@ -112,7 +216,6 @@ class SocketRegistry:
     ):
         self._context = context
         self._sockets: Dict[str, zmq.asyncio.Socket] = {}
-        self._lock = threading.Lock()
         self._linger_ms = linger_ms
         self._logger = logger
         self._metrics = metrics
@@ -120,27 +223,32 @@ class SocketRegistry:
     def get_or_create(
         self, key: str, create_fn: Callable[[], zmq.asyncio.Socket]
     ) -> zmq.asyncio.Socket:
-        with self._lock:
-            if key not in self._sockets:
-                sock = create_fn()
-                self._sockets[key] = sock
-                self._metrics.active_connections += 1
-            return self._sockets[key]
+        sock = self._sockets.get(key)
+        if sock is None:
+            sock = self._sockets[key] = create_fn()
+            self._metrics.active_connections += 1
+        return sock
+
+    def get(self, key: str) -> Optional[zmq.asyncio.Socket]:
+        # 发送热路径的快速查找：已创建的 socket 直接返回，不构造 create_fn
+        return self._sockets.get(key)
 
     def pop(self, key: str):
-        with self._lock:
-            return self._sockets.pop(key, None)
+        sock = self._sockets.pop(key, None)
+        if sock is not None:
+            self._metrics.active_connections -= 1
+        return sock
 
     def close_all(self):
-        with self._lock:
-            for key, sock in list(self._sockets.items()):
-                try:
-                    sock.setsockopt(zmq.LINGER, self._linger_ms)
-                    sock.close()
-                except Exception as e:
-                    self._logger.error(f"Error closing socket {key}: {e}")
-            self._sockets.clear()
-            self._metrics.active_connections = 0
+        sockets = list(self._sockets.items())
+        self._sockets.clear()
+        for key, sock in sockets:
+            try:
+                sock.setsockopt(zmq.LINGER, self._linger_ms)
+                sock.close()
+            except Exception as e:
+                self._logger.error(f"Error closing socket {key}: {e}")
+        self._metrics.active_connections = 0
 
 
 # ===================== MessageBus 主体 =====================
@@ -149,22 +257,40 @@ class MessageBus:
     精简版统一消息总线：
     - PUB/SUB
     - PUSH/PULL
-    - REQ/REP
+    - REQ/REP（DEALER/ROUTER + request-id 关联实现）
     重点：
     - 单文件可读
     - 失败 socket 冷却
-    - REQ 并发安全
+    - DEALER/ROUTER 请求关联，支持并发请求
     - 处理器并发可配置
     """
 
-    def __init__(self, service_name: str, config: Dict[str, Any] = None):
+    def __init__(
+        self,
+        service_name: str,
+        config: Dict[str, Any] = None,
+        context: Optional[zmq.asyncio.Context] = None,
+    ):
         self.service_name = service_name
         self.config = {**DEFAULT_CONFIG, **(config or {})}
 
         self.logger = logging.getLogger(f"messagebus.{service_name}")
         self.log_utils = get_log_utils()
-
-        self.context = zmq.asyncio.Context()
+        if isinstance(self.log_utils, _NullLogUtils):
+            # 无日志服务时 _log 直接置空，调用处不再转发
+            self._log = self._discard_log
+
+        # Context 来源：external（调用方传入，不由本实例 term）/ shared（引用计数）/ owned
+        # inproc 要求所有端点共享同一个 Context
+        if context is not None:
+            self._context_mode = "external"
+            self.context = context
+        elif self.config["shared_context"] or self.config["transport"] == "inproc":
+            self._context_mode = "shared"
+            self.context = _acquire_shared_context(self.config["io_threads"])
+        else:
+            self._context_mode = "owned"
+            self.context = zmq.asyncio.Context(io_threads=self.config["io_threads"])
         self.metrics = BusMetrics()
 
         self.serializer: Serializer = build_serializer(self.config["serializer"])
@@ -180,8 +306,15 @@ class MessageBus:
         self.failed_sockets: Dict[str, float] = {}
         self.failed_bind_sockets: Set[str] = set()
 
-        # REQ 并发锁
-        self._req_locks: Dict[str, asyncio.Lock] = {}
+        # DEALER 请求关联：req_id -> 等待回复的 Future；每个 DEALER socket 一个读取协程
+        self._pending_requests: Dict[bytes, asyncio.Future] = {}
+        self._dealer_readers: Dict[str, asyncio.Task] = {}
+
+        # XPUB 订阅跟踪：socket_key -> 当前被订阅的主题前缀
+        self._pub_subscriptions: Dict[str, Set[bytes]] = {}
+
+        # publish 攒批缓冲：(topic, port) -> 待发送的 data 列表
+        self._pub_buffers: Dict[Tuple[str, int], List[Any]] = {}
 
         # 订阅处理器
         self._handlers: Dict[str, Callable] = {}
@@ -201,6 +334,10 @@ class MessageBus:
     def _log(self, level: str, msg: str):
         self.log_utils.log_message(self.service_name, level, msg)
 
+    @staticmethod
+    def _discard_log(level: str, msg: str):
+        pass
+
     def _is_failed_and_in_cooldown(self, key: str) -> bool:
         if key not in self.failed_sockets:
             return False
@@ -213,6 +350,10 @@ class MessageBus:
 
     def _fail_socket(self, key: str):
         # 关闭并标记
+        reader = self._dealer_readers.pop(key, None)
+        if reader and not reader.done():
+            reader.cancel()
+        self._pub_subscriptions.pop(key, None)
         sock = self.sockets.pop(key)
         if sock:
             try:
@@ -224,100 +365,222 @@ class MessageBus:
     def get_metrics(self) -> Dict[str, Any]:
         return self.metrics.as_dict()
 
+    @staticmethod
+    async def _await_send(fut: asyncio.Future, timeout: float):
+        """
+        pyzmq 在 socket 可写时会先以 DONTWAIT 直接发送并返回已完成的 Future：
+        此时直接取结果，只有真正排队（EAGAIN）时才用 wait_for 计时。
+        """
+        if fut.done():
+            fut.result()
+        else:
+            await asyncio.wait_for(fut, timeout=timeout)
+
+    def _recv_batch(
+        self, sock: zmq.asyncio.Socket, first: Any, multipart: bool, copy: bool = True
+    ) -> List[Any]:
+        """在已收到 first 的基础上，非阻塞地取出已就绪的消息，最多 recv_batch_max 条。"""
+        batch = [first]
+        limit = self.config["recv_batch_max"]
+        while len(batch) < limit:
+            # NOBLOCK 下 asyncio socket 返回已完成的 Future，无需 await
+            fut = (
+                sock.recv_multipart(flags=zmq.NOBLOCK, copy=copy)
+                if multipart
+                else sock.recv(flags=zmq.NOBLOCK, copy=copy)
+            )
+            try:
+                batch.append(fut.result())
+            except zmq.Again:
+                break
+        return batch
+
     # ---------- Socket 创建函数 ----------
-    def _create_pub(self, port: int) -> zmq.asyncio.Socket:
-        sock = self.context.socket(zmq.PUB)
-        try:
-            sock.setsockopt(zmq.SO_REUSEADDR, 1)
-        except Exception:
-            pass
+    def _tune_socket(self, sock: zmq.asyncio.Socket, connect: bool):
         sock.setsockopt(zmq.LINGER, self.config["close_linger_ms"])
+        if self.config["tcp_keepalive"]:
+            sock.setsockopt(zmq.TCP_KEEPALIVE, 1)
+        if connect and self.config["immediate"]:
+            sock.setsockopt(zmq.IMMEDIATE, 1)
+        # 内核 socket 缓冲区（字节），突发流量下减少丢包/阻塞；0 表示沿用系统默认
+        if self.config["sndbuf"]:
+            sock.setsockopt(zmq.SNDBUF, self.config["sndbuf"])
+        if self.config["rcvbuf"]:
+            sock.setsockopt(zmq.RCVBUF, self.config["rcvbuf"])
+
+    def _endpoint(self, port: int, bind: bool) -> str:
+        transport = self.config["transport"]
+        if transport == "ipc":
+            return f"ipc://{self.config['ipc_dir']}/snail_trader-{port}.sock"
+        if transport == "inproc":
+            return f"inproc://snail_trader-{port}"
+        if transport != "tcp":
+            raise ValueError(f"Unsupported transport: {transport}")
+        return f"tcp://*:{port}" if bind else f"tcp://localhost:{port}"
+
+    def _create_pub(self, port: int) -> zmq.asyncio.Socket:
+        # XPUB 与 PUB 行为一致，另外把 SUB 端的订阅/退订以帧的形式交给发布端
+        track = self.config["pub_skip_unsubscribed"]
+        sock = self.context.socket(zmq.XPUB if track else zmq.PUB)
+        self._tune_socket(sock, connect=False)
         sock.setsockopt(zmq.SNDHWM, self.config["hwm_outbound"])
-        sock.bind(f"tcp://*:{port}")
+        sock.bind(self._endpoint(port, bind=True))
         return sock
 
     def _create_sub(self, port: int, topics: Optional[List[str]]) -> zmq.asyncio.Socket:
         sock = self.context.socket(zmq.SUB)
-        sock.setsockopt(zmq.LINGER, self.config["close_linger_ms"])
+        self._tune_socket(sock, connect=True)
         sock.setsockopt(zmq.RCVHWM, self.config["hwm_inbound"])
-        sock.connect(f"tcp://localhost:{port}")
+        sock.connect(self._endpoint(port, bind=False))
         if topics:
             for t in topics:
-                sock.setsockopt_string(zmq.SUBSCRIBE, t)
+                sock.setsockopt(zmq.SUBSCRIBE, _topic_bytes(t))
         else:
-            sock.setsockopt_string(zmq.SUBSCRIBE, "")
+            sock.setsockopt(zmq.SUBSCRIBE, b"")
         return sock
 
     def _create_push(self, port: int) -> zmq.asyncio.Socket:
         sock = self.context.socket(zmq.PUSH)
-        sock.setsockopt(zmq.LINGER, self.config["close_linger_ms"])
+        self._tune_socket(sock, connect=True)
         sock.setsockopt(zmq.SNDHWM, self.config["hwm_outbound"])
-        sock.connect(f"tcp://localhost:{port}")
+        sock.connect(self._endpoint(port, bind=False))
         return sock
 
     def _create_pull(self, port: int) -> zmq.asyncio.Socket:
         sock = self.context.socket(zmq.PULL)
-        try:
-            sock.setsockopt(zmq.SO_REUSEADDR, 1)
-        except Exception:
-            pass
-        sock.setsockopt(zmq.LINGER, self.config["close_linger_ms"])
+        self._tune_socket(sock, connect=False)
         sock.setsockopt(zmq.RCVHWM, self.config["hwm_inbound"])
-        sock.bind(f"tcp://*:{port}")
+        sock.bind(self._endpoint(port, bind=True))
         return sock
 
-    def _create_req(self, port: int) -> zmq.asyncio.Socket:
-        sock = self.context.socket(zmq.REQ)
-        sock.setsockopt(zmq.LINGER, self.config["close_linger_ms"])
-        sock.connect(f"tcp://localhost:{port}")
+    def _create_dealer(self, port: int) -> zmq.asyncio.Socket:
+        sock = self.context.socket(zmq.DEALER)
+        self._tune_socket(sock, connect=True)
+        sock.connect(self._endpoint(port, bind=False))
         return sock
 
-    def _create_rep(self, port: int) -> zmq.asyncio.Socket:
-        sock = self.context.socket(zmq.REP)
-        try:
-            sock.setsockopt(zmq.SO_REUSEADDR, 1)
-        except Exception:
-            pass
-        sock.setsockopt(zmq.LINGER, self.config["close_linger_ms"])
-        sock.bind(f"tcp://*:{port}")
+    def _create_router(self, port: int) -> zmq.asyncio.Socket:
+        sock = self.context.socket(zmq.ROUTER)
+        self._tune_socket(sock, connect=False)
+        sock.bind(self._endpoint(port, bind=True))
         return sock
 
     # ---------- PUB ----------
+    def _create_pub_tracked(self, socket_key: str, port: int) -> zmq.asyncio.Socket:
+        try:
+            sock = self._create_pub(port)
+            if self.config["pub_skip_unsubscribed"]:
+                self._pub_subscriptions[socket_key] = set()
+            return sock
+        except zmq.error.ZMQError as e:
+            if "Address already in use" in str(e):
+                self.metrics.failed_bind_count += 1
+                self.failed_bind_sockets.add(socket_key)
+            raise
+
+    def _has_subscriber(self, socket_key: str, sock: zmq.asyncio.Socket, topic_b: bytes) -> bool:
+        """XPUB：判断 topic 是否有订阅者（SUB 按前缀匹配），必要时先读取积压的订阅帧。"""
+        subs = self._pub_subscriptions[socket_key]
+        if self._matches_subscription(subs, topic_b):
+            return True
+        # 只有在看起来无人订阅时才检查积压的订阅帧，避免刚到达的订阅被误判
+        if not sock.getsockopt(zmq.EVENTS) & zmq.POLLIN:
+            return False
+        while True:
+            try:
+                # NOBLOCK 下 asyncio socket 返回已完成的 Future，无需 await
+                frame = sock.recv(flags=zmq.NOBLOCK).result()
+            except zmq.Again:
+                break
+            if not frame:
+                continue
+            # 非 verbose XPUB：首个订阅 0x01+topic，最后一个退订 0x00+topic
+            if frame[0] == 1:
+                subs.add(frame[1:])
+            elif frame[0] == 0:
+                subs.discard(frame[1:])
+        return self._matches_subscription(subs, topic_b)
+
+    @staticmethod
+    def _matches_subscription(subs: Set[bytes], topic_b: bytes) -> bool:
+        if topic_b in subs or b"" in subs:
+            return True
+        return any(topic_b.startswith(prefix) for prefix in subs)
+
     async def publish(
         self, topic: str, data: Dict[str, Any], port: int = Ports.GLOBAL_EVENTS
-    ):
+    ) -> None:
+        if self.config["pub_coalesce_ms"]:
+            full = self._buffer_publish(topic, data, port)
+            if full:
+                await self.publish_batch(topic, full, port)
+            return
+        await self._send_pub(topic, port, "data", data)
+
+    async def publish_batch(
+        self, topic: str, items: List[Any], port: int = Ports.GLOBAL_EVENTS
+    ) -> None:
+        """一次序列化、一帧发送多条数据；订阅端逐条拆分给 handler，handler 无需区分。"""
+        if items:
+            await self._send_pub(topic, port, "batch", items)
+
+    def _buffer_publish(self, topic: str, data: Dict[str, Any], port: int) -> Optional[List[Any]]:
+        """加入攒批缓冲；达到 pub_coalesce_max 时取出整批交给调用方立即发送。"""
+        key = (topic, port)
+        buf = self._pub_buffers.get(key)
+        if buf is None:
+            buf = self._pub_buffers[key] = []
+            flusher = asyncio.create_task(self._flush_pub_buffer(key, buf))
+            self._running_tasks.add(flusher)
+            flusher.add_done_callback(self._running_tasks.discard)
+        buf.append(data)
+        if len(buf) >= self.config["pub_coalesce_max"]:
+            del self._pub_buffers[key]
+            return buf
+        return None
+
+    async def _flush_pub_buffer(self, key: Tuple[str, int], buf: List[Any]):
+        await asyncio.sleep(self.config["pub_coalesce_ms"] / 1000)
+        # 只发出自己负责的那一批；已因达到上限被取走时跳过
+        if self._pub_buffers.get(key) is buf:
+            del self._pub_buffers[key]
+            await self.publish_batch(key[0], buf, key[1])
+
+    async def _send_pub(self, topic: str, port: int, body_key: str, body: Any):
         socket_key = f"pub:{port}"
         if self._is_failed_and_in_cooldown(socket_key):
             self.metrics.outbound_dropped += 1
             return
 
         try:
+            sock = self.sockets.get(socket_key)
+            if sock is None:
+                sock = self.sockets.get_or_create(
+                    socket_key, lambda: self._create_pub_tracked(socket_key, port)
+                )
 
-            def create_fn():
-                try:
-                    return self._create_pub(port)
-                except zmq.error.ZMQError as e:
-                    if "Address already in use" in str(e):
-                        self.metrics.failed_bind_count += 1
-                        self.failed_bind_sockets.add(socket_key)
-                        raise
-                    raise
-
-            sock = self.sockets.get_or_create(socket_key, create_fn)
+            topic_b = _topic_bytes(topic)
+            if socket_key in self._pub_subscriptions and not self._has_subscriber(
+                socket_key, sock, topic_b
+            ):
+                self.metrics.publish_skipped += 1
+                return
 
             msg = {
                 "topic": topic,
                 "sender": self.service_name,
                 "ts": time.time(),
-                "data": data,
+                body_key: body,
             }
             payload = self.serializer.dumps(msg)
-            await asyncio.wait_for(
-                sock.send_multipart([topic.encode(), payload.encode()]),
-                timeout=self.config["pub_send_timeout"],
+            await self._await_send(
+                sock.send_multipart([topic_b, payload], copy=False),
+                self.config["pub_send_timeout"],
             )
             self.metrics.messages_sent += 1
-            self._log("DEBUG", f"Published topic={topic} data={data}")
+            # 热路径：未开启 DEBUG 时不格式化消息内容
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self._log("DEBUG", f"Published topic={topic} {body_key}={body}")
 
         except asyncio.TimeoutError:
             self.metrics.errors += 1
@@ -351,29 +614,19 @@ class MessageBus:
         self._log("INFO", f"Subscribe loop started on port {port}, topics={topics}")
 
         try:
+            # 直接阻塞在 recv 上，停止由 cleanup 取消任务触发，不再需要定时唤醒
+            copy = not self.config["recv_zero_copy"]
             while True:
-                try:
-                    parts = await asyncio.wait_for(sock.recv_multipart(), timeout=1.0)
-                except asyncio.TimeoutError:
-                    continue
-
-                if len(parts) != 2:
-                    self.metrics.inbound_dropped += 1
-                    continue
-
-                topic = parts[0].decode()
-                raw = parts[1].decode()
-                self.metrics.messages_received += 1
-
-                try:
-                    msg = self.serializer.loads(raw)
-                except Exception as e:
-                    self.metrics.errors += 1
-                    self.metrics.inbound_dropped += 1
-                    self._log("ERROR", f"JSON decode error: {e}; head={raw[:80]}")
-                    continue
-
-                await self._dispatch_handler(topic, msg)
+                first = await sock.recv_multipart(copy=copy)
+                for parts in self._recv_batch(sock, first, multipart=True, copy=copy):
+                    try:
+                        await self._on_sub_frames(parts)
+                    except Exception as e:
+                        self.metrics.errors += 1
+                        self.metrics.inbound_dropped += 1
+                        self._log("ERROR", f"Subscribe message error: {e}")
+                # 一批处理完后让出，避免高频 topic 饿死其他协程
+                await asyncio.sleep(0)
 
         except asyncio.CancelledError:
             self._log("INFO", f"Subscribe loop cancelled port={port}")
@@ -385,6 +638,36 @@ class MessageBus:
             if task in self._running_tasks:
                 self._running_tasks.remove(task)
 
+    async def _on_sub_frames(self, parts: List[Any]):
+        if len(parts) != 2:
+            self.metrics.inbound_dropped += 1
+            return
+
+        topic_b = parts[0] if isinstance(parts[0], bytes) else parts[0].bytes
+        topic = topic_b.decode()
+        raw = _frame_view(parts[1])
+        self.metrics.messages_received += 1
+
+        try:
+            msg = self.serializer.loads(raw)
+        except Exception as e:
+            self.metrics.errors += 1
+            self.metrics.inbound_dropped += 1
+            self._log("ERROR", f"Decode error: {e}; head={bytes(raw[:80])!r}")
+            return
+
+        batch = msg.get("batch")
+        if batch is None:
+            await self._dispatch_handler(topic, msg)
+            return
+        # publish_batch：逐条还原为单条消息格式
+        sender = msg.get("sender")
+        ts = msg.get("ts")
+        for item in batch:
+            await self._dispatch_handler(
+                topic, {"topic": topic, "sender": sender, "ts": ts, "data": item}
+            )
+
     def register_handler(self, topic: str, handler: Callable):
         # 自动包装同步函数
         if not inspect.iscoroutinefunction(handler):
@@ -418,19 +701,53 @@ class MessageBus:
             self._log("ERROR", f"Handler error topic={topic}: {e}")
 
     # ---------- PUSH ----------
-    async def push_result(self, data: Dict[str, Any], port: int = Ports.TASK_RESULTS):
+    async def push_result(
+        self, data: Dict[str, Any], port: int = Ports.TASK_RESULTS
+    ) -> None:
+        await self._send_push(port, "data", data)
+
+    async def push_batch(
+        self, items: List[Any], port: int = Ports.TASK_RESULTS
+    ) -> None:
+        """一次序列化、一帧推送多条数据；拉取端逐条拆分给 _handle_pulled_message。"""
+        if items:
+            await self._send_push(port, "batch", items)
+
+    async def push_rows(
+        self, rows: List[Any], port: int = Ports.TASK_RESULTS, **meta: Any
+    ) -> None:
+        """
+        推送 AbstractTask 结果行 [task_id, timestamp, kind, payload]；meta（strategy_id）
+        放在信封上每帧只发一次，拉取端还原为逐条 data。
+        """
+        if rows:
+            await self._send_push(port, "rows", rows, meta)
+
+    async def _send_push(
+        self,
+        port: int,
+        body_key: str,
+        body: Any,
+        meta: Optional[Dict[str, Any]] = None,
+    ):
+        # 批量标记（batch/rows）放在信封而非用户 data 内，避免与业务字段冲突
         socket_key = f"push:{port}"
         if self._is_failed_and_in_cooldown(socket_key):
             self.metrics.outbound_dropped += 1
             return
         try:
-            sock = self.sockets.get_or_create(
-                socket_key, lambda: self._create_push(port)
-            )
-            msg = {"sender": self.service_name, "ts": time.time(), "data": data}
+            sock = self.sockets.get(socket_key)
+            if sock is None:
+                sock = self.sockets.get_or_create(
+                    socket_key, lambda: self._create_push(port)
+                )
+            msg = {"sender": self.service_name, "ts": time.time(), body_key: body}
+            if meta:
+                msg.update(meta)
             payload = self.serializer.dumps(msg)
-            await asyncio.wait_for(
-                sock.send_string(payload), timeout=self.config["push_send_timeout"]
+            await self._await_send(
+                sock.send(payload, copy=False),
+                self.config["push_send_timeout"],
             )
             self.metrics.messages_sent += 1
         except asyncio.TimeoutError:
@@ -472,22 +789,18 @@ class MessageBus:
         self._log("INFO", f"Pull loop started port={port}")
 
         try:
+            copy = not self.config["recv_zero_copy"]
             while True:
-                try:
-                    raw = await asyncio.wait_for(sock.recv_string(), timeout=1.0)
-                except asyncio.TimeoutError:
-                    continue
-
-                self.metrics.messages_received += 1
-                try:
-                    msg = self.serializer.loads(raw)
-                except Exception as e:
-                    self.metrics.errors += 1
-                    self.metrics.inbound_dropped += 1
-                    self._log("ERROR", f"Pull JSON decode error: {e}; head={raw[:80]}")
-                    continue
-
-                await self._handle_pulled_message(msg)
+                first = await sock.recv(copy=copy)
+                for frame in self._recv_batch(sock, first, multipart=False, copy=copy):
+                    # 单条消息出错只丢弃该条，不终止拉取循环
+                    try:
+                        await self._on_pulled_raw(_frame_view(frame))
+                    except Exception as e:
+                        self.metrics.errors += 1
+                        self.metrics.inbound_dropped += 1
+                        self._log("ERROR", f"Pull message error: {e}")
+                await asyncio.sleep(0)
 
         except asyncio.CancelledError:
             self._log("INFO", f"Pull loop cancelled port={port}")
@@ -499,11 +812,43 @@ class MessageBus:
             if task in self._running_tasks:
                 self._running_tasks.remove(task)
 
+    async def _on_pulled_raw(self, raw: bytes):
+        self.metrics.messages_received += 1
+        try:
+            msg = self.serializer.loads(raw)
+        except Exception as e:
+            self.metrics.errors += 1
+            self.metrics.inbound_dropped += 1
+            self._log("ERROR", f"Pull decode error: {e}; head={bytes(raw[:80])!r}")
+            return
+
+        if not isinstance(msg, dict) or "data" in msg:
+            await self._handle_pulled_message(msg)
+            return
+
+        batch = msg.get("batch")
+        rows = msg.get("rows")
+        if rows is not None:
+            # push_rows：行格式 [task_id, timestamp, kind, payload]，strategy_id 在信封上
+            strategy_id = msg.get("strategy_id")
+            batch = [
+                {"task_id": task_id, "strategy_id": strategy_id, "timestamp": ts, kind: payload}
+                for task_id, ts, kind, payload in rows
+            ]
+        if batch is None:
+            await self._handle_pulled_message(msg)
+            return
+        # 批量推送：逐条还原为 push_result 的单条消息格式
+        sender = msg.get("sender")
+        ts = msg.get("ts")
+        for item in batch:
+            await self._handle_pulled_message({"sender": sender, "ts": ts, "data": item})
+
     async def _handle_pulled_message(self, message: Dict[str, Any]):
         # 供子类扩展
         self.logger.debug(f"Pulled message: {message}")
 
-    # ---------- REQ ----------
+    # ---------- REQ (DEALER) ----------
     async def request(
         self,
         data: Dict[str, Any],
@@ -514,56 +859,93 @@ class MessageBus:
         if self._is_failed_and_in_cooldown(socket_key):
             return None
 
-        if socket_key not in self._req_locks:
-            self._req_locks[socket_key] = asyncio.Lock()
-        lock = self._req_locks[socket_key]
-
         total_timeout = timeout or self.config["req_total_timeout"]
-        half = total_timeout / 2
+        req_id = uuid.uuid4().bytes
+        fut = asyncio.get_running_loop().create_future()
 
-        async with lock:
-            try:
+        try:
+            sock = self.sockets.get(socket_key)
+            if sock is None:
                 sock = self.sockets.get_or_create(
-                    socket_key, lambda: self._create_req(port)
+                    socket_key, lambda: self._create_dealer(port)
                 )
-                payload = self.serializer.dumps(
-                    {"sender": self.service_name, "ts": time.time(), "data": data}
-                )
-                await asyncio.wait_for(sock.send_string(payload), timeout=half)
-                self.metrics.messages_sent += 1
+            self._ensure_dealer_reader(socket_key, sock)
 
-                resp_raw = await asyncio.wait_for(sock.recv_string(), timeout=half)
-                self.metrics.messages_received += 1
-                try:
-                    return self.serializer.loads(resp_raw)
-                except Exception as e:
-                    self.metrics.errors += 1
-                    self._log("ERROR", f"Request JSON decode error: {e}")
-                    return None
-
-            except asyncio.TimeoutError:
-                self.metrics.errors += 1
-                self.metrics.request_timeouts += 1
-                self._fail_socket(socket_key)
-                self._log("ERROR", f"Request timeout port={port}")
-                return None
-            except zmq.error.ZMQError as e:
-                self.metrics.errors += 1
-                self._fail_socket(socket_key)
-                self._log("ERROR", f"Request ZMQError: {e}")
-                return None
+            payload = self.serializer.dumps(
+                {"sender": self.service_name, "ts": time.time(), "data": data}
+            )
+            self._pending_requests[req_id] = fut
+            await self._await_send(
+                sock.send_multipart([b"", req_id, payload], copy=False),
+                total_timeout / 2,
+            )
+            self.metrics.messages_sent += 1
+
+            resp_raw = await asyncio.wait_for(fut, timeout=total_timeout / 2)
+            try:
+                return self.serializer.loads(resp_raw)
             except Exception as e:
                 self.metrics.errors += 1
-                self._fail_socket(socket_key)
-                self._log("ERROR", f"Request unexpected error: {e}")
+                self._log("ERROR", f"Request decode error: {e}")
                 return None
 
-    # ---------- REP ----------
+        except asyncio.TimeoutError:
+            # DEALER 无锁步状态，超时只丢弃本次请求，不需要重建 socket
+            self.metrics.errors += 1
+            self.metrics.request_timeouts += 1
+            self._log("ERROR", f"Request timeout port={port}")
+            return None
+        except zmq.error.ZMQError as e:
+            self.metrics.errors += 1
+            self._fail_socket(socket_key)
+            self._log("ERROR", f"Request ZMQError: {e}")
+            return None
+        except Exception as e:
+            self.metrics.errors += 1
+            self._fail_socket(socket_key)
+            self._log("ERROR", f"Request unexpected error: {e}")
+            return None
+        finally:
+            self._pending_requests.pop(req_id, None)
+
+    def _ensure_dealer_reader(self, socket_key: str, sock: zmq.asyncio.Socket):
+        reader = self._dealer_readers.get(socket_key)
+        if reader is None or reader.done():
+            self._dealer_readers[socket_key] = asyncio.create_task(
+                self._dealer_reader_loop(socket_key, sock)
+            )
+
+    async def _dealer_reader_loop(self, socket_key: str, sock: zmq.asyncio.Socket):
+        """按 request-id 将回复分发给等待中的 request 调用。"""
+        task = asyncio.current_task()
+        self._running_tasks.add(task)
+        try:
+            while True:
+                parts = await sock.recv_multipart()
+                if len(parts) != 3:
+                    self.metrics.inbound_dropped += 1
+                    continue
+                self.metrics.messages_received += 1
+                fut = self._pending_requests.get(parts[1])
+                if fut is None or fut.done():
+                    # 已超时的请求，丢弃迟到的回复
+                    self.metrics.inbound_dropped += 1
+                    continue
+                fut.set_result(parts[2])
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.metrics.errors += 1
+            self._log("ERROR", f"Dealer reader error {socket_key}: {e}")
+        finally:
+            self._running_tasks.discard(task)
+
+    # ---------- REP (ROUTER) ----------
     async def response_loop(self, port: int = Ports.STATE_MANAGEMENT):
         socket_key = f"rep:{port}"
         try:
             sock = self.sockets.get_or_create(
-                socket_key, lambda: self._create_rep(port)
+                socket_key, lambda: self._create_router(port)
             )
         except zmq.error.ZMQError as e:
             if "Address already in use" in str(e):
@@ -584,42 +966,19 @@ class MessageBus:
 
         try:
             while True:
-                try:
-                    req_raw = await asyncio.wait_for(
-                        sock.recv_string(), timeout=self.config["rep_recv_timeout"]
-                    )
-                except asyncio.TimeoutError:
-                    continue
-
-                self.metrics.messages_received += 1
-                try:
-                    req = self.serializer.loads(req_raw)
-                except Exception as e:
-                    self.metrics.errors += 1
-                    err_resp = self.serializer.dumps(
-                        {"error": f"Invalid JSON: {e}", "ts": time.time()}
-                    )
-                    await sock.send_string(err_resp)
-                    continue
-
-                try:
-                    resp_obj = await self._handle_request(req)
-                except Exception as e:
-                    self.metrics.errors += 1
-                    resp_obj = {"error": f"Handler error: {e}", "ts": time.time()}
-
-                resp_raw = self.serializer.dumps(resp_obj)
-
-                try:
-                    await asyncio.wait_for(
-                        sock.send_string(resp_raw),
-                        timeout=self.config["rep_send_timeout"],
-                    )
-                    self.metrics.messages_sent += 1
-                except asyncio.TimeoutError:
-                    self.metrics.errors += 1
-                    self._log("ERROR", "Response send timeout - breaking loop")
-                    break
+                first = await sock.recv_multipart()
+                for parts in self._recv_batch(sock, first, multipart=True):
+                    # [identity, b"", req_id, payload]
+                    if len(parts) != 4:
+                        self.metrics.inbound_dropped += 1
+                        continue
+
+                    self.metrics.messages_received += 1
+                    # 每个请求独立处理，回复按完成顺序返回，不再锁步
+                    reply = asyncio.create_task(self._reply(sock, parts))
+                    self._running_tasks.add(reply)
+                    reply.add_done_callback(self._running_tasks.discard)
+                await asyncio.sleep(0)
 
         except asyncio.CancelledError:
             self._log("INFO", f"Response loop cancelled port={port}")
@@ -631,6 +990,41 @@ class MessageBus:
             if task in self._running_tasks:
                 self._running_tasks.remove(task)
 
+    async def _reply(self, sock: zmq.asyncio.Socket, parts: List[bytes]):
+        identity, _, req_id, req_raw = parts
+        try:
+            req = self.serializer.loads(req_raw)
+        except Exception as e:
+            self.metrics.errors += 1
+            resp_obj = {"error": f"Invalid payload: {e}", "ts": time.time()}
+        else:
+            try:
+                resp_obj = await self._handle_request(req)
+            except Exception as e:
+                self.metrics.errors += 1
+                resp_obj = {"error": f"Handler error: {e}", "ts": time.time()}
+
+        try:
+            resp_raw = self.serializer.dumps(resp_obj)
+        except Exception as e:
+            # handler 返回了无法序列化的对象：回复错误，避免请求方一直等到超时
+            self.metrics.errors += 1
+            resp_raw = self.serializer.dumps(
+                {"error": f"Serialize error: {e}", "ts": time.time()}
+            )
+        try:
+            await self._await_send(
+                sock.send_multipart([identity, b"", req_id, resp_raw], copy=False),
+                self.config["rep_send_timeout"],
+            )
+            self.metrics.messages_sent += 1
+        except asyncio.TimeoutError:
+            self.metrics.errors += 1
+            self._log("ERROR", "Response send timeout")
+        except zmq.error.ZMQError as e:
+            self.metrics.errors += 1
+            self._log("ERROR", f"Response ZMQError: {e}")
+
     async def _handle_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
         # 子类覆盖
         return {"status": "not_implemented"}
@@ -638,6 +1032,10 @@ class MessageBus:
     # ---------- 清理 ----------
     async def cleanup(self, cancel_running: bool = True):
         self._log("INFO", "MessageBus cleanup start")
+        # 先发出尚在攒批中的 publish
+        pending, self._pub_buffers = self._pub_buffers, {}
+        for (topic, port), items in pending.items():
+            await self.publish_batch(topic, items, port)
         if cancel_running:
             for task in list(self._running_tasks):
                 if not task.done():
@@ -647,8 +1045,12 @@ class MessageBus:
             self._running_tasks.clear()
 
         self.sockets.close_all()
+        mode, self._context_mode = self._context_mode, "released"
         try:
-            self.context.term()
+            if mode == "shared":
+                _release_shared_context(self.context)
+            elif mode == "owned":
+                self.context.term()
         except Exception as e:
             self._log("ERROR", f"Context term error: {e}")
         self._log("INFO", f"Cleanup done. Final metrics={self.metrics.as_dict()}")
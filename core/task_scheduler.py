@@ -0,0 +1,142 @@
+"""
+Priority task scheduler for strategy-spawned tasks.
+
+Design decisions:
+- One scheduler per process, shared by all strategies, so priorities are
+  compared across strategies rather than within each one
+- Each group (normally a strategy_id) has its own concurrency budget; a busy
+  group never blocks dispatch for other groups
+- Waiting tasks age: effective priority drops by one level per
+  aging_interval seconds waited, so LOW tasks cannot be starved forever
+- "One per process" means one per running event loop: the scheduler's Event
+  and tasks belong to a loop, so a new asyncio.run() gets a fresh scheduler
+"""
+
+import asyncio
+import itertools
+import logging
+import time
+import weakref
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from .constants import TaskPriority
+
+_logger = logging.getLogger("task_scheduler")
+
+
+@dataclass
+class _PendingTask:
+    priority: int
+    seq: int
+    task: Any
+    group: str
+    weight: int
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+class PriorityTaskScheduler:
+    """
+    Dispatch tasks by aged priority under per-group concurrency limits.
+
+    submit() is synchronous so strategies can call spawn_task() from step()
+    without awaiting; a background dispatcher starts tasks as capacity frees.
+    """
+
+    def __init__(self, max_concurrency_per_group: int = 4, aging_interval: float = 1.0):
+        self.max_concurrency_per_group = max(1, max_concurrency_per_group)
+        self.aging_interval = aging_interval
+
+        self._seq = itertools.count()
+        self._waiting: List[_PendingTask] = []
+        self._in_use: Dict[str, int] = {}
+        self._running: Dict[asyncio.Task, _PendingTask] = {}
+        self._wakeup = asyncio.Event()
+        self._dispatcher: Optional[asyncio.Task] = None
+
+    def submit(self, task, priority: int = TaskPriority.LOW, group: str = "default", weight: int = 1):
+        """Queue a task instance; its run() starts when it is the best runnable entry."""
+        weight = min(max(1, weight), self.max_concurrency_per_group)
+        self._waiting.append(_PendingTask(priority, next(self._seq), task, group, weight))
+        self._wakeup.set()
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.create_task(self._dispatch_loop())
+        return task
+
+    def effective_priority(self, entry: _PendingTask, now: float) -> float:
+        if self.aging_interval <= 0:
+            return entry.priority
+        return entry.priority - (now - entry.enqueued_at) // self.aging_interval
+
+    def _next_runnable(self) -> Optional[_PendingTask]:
+        now = time.monotonic()
+        best = None
+        best_key = None
+        for entry in self._waiting:
+            if self._in_use.get(entry.group, 0) + entry.weight > self.max_concurrency_per_group:
+                continue
+            key = (self.effective_priority(entry, now), entry.seq)
+            if best_key is None or key < best_key:
+                best, best_key = entry, key
+        return best
+
+    async def _dispatch_loop(self):
+        try:
+            while True:
+                entry = self._next_runnable()
+                if entry is None:
+                    self._wakeup.clear()
+                    await self._wakeup.wait()
+                    continue
+
+                self._waiting.remove(entry)
+                self._in_use[entry.group] = self._in_use.get(entry.group, 0) + entry.weight
+                running = asyncio.create_task(entry.task.run())
+                self._running[running] = entry
+                running.add_done_callback(self._on_task_done)
+                # Yield so a burst of submits cannot monopolise the loop
+                await asyncio.sleep(0)
+        except Exception:
+            # Nothing awaits the dispatcher; log before the waiting tasks stall.
+            # The next submit() starts a new dispatcher.
+            _logger.exception("Task dispatcher stopped with %d task(s) waiting", len(self._waiting))
+            raise
+
+    def _on_task_done(self, running: asyncio.Task):
+        entry = self._running.pop(running, None)
+        if entry is not None:
+            self._in_use[entry.group] -= entry.weight
+        self._wakeup.set()
+
+    async def cancel_group(self, group: str):
+        """Drop waiting tasks and cancel running tasks belonging to group."""
+        self._waiting = [e for e in self._waiting if e.group != group]
+        tasks = [t for t, e in self._running.items() if e.group == group]
+        for t in tasks:
+            t.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "waiting": len(self._waiting),
+            "running": len(self._running),
+            "in_use": dict(self._in_use),
+        }
+
+
+_schedulers: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, PriorityTaskScheduler]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_task_scheduler(config: Optional[Dict[str, Any]] = None) -> PriorityTaskScheduler:
+    """Return the running loop's scheduler, creating it from config on first use."""
+    loop = asyncio.get_running_loop()
+    scheduler = _schedulers.get(loop)
+    if scheduler is None:
+        config = config or {}
+        scheduler = _schedulers[loop] = PriorityTaskScheduler(
+            max_concurrency_per_group=config.get("task_max_concurrency_per_group", 4),
+            aging_interval=config.get("task_aging_interval_s", 1.0),
+        )
+    return scheduler
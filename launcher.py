@@ -4,6 +4,15 @@ from utils.config_utils import Config
 from utils.welcome import run_welcome
 
 
+def run_event_loop(main):
+    """Run the coroutine on uvloop when it is installed, else on the default asyncio loop."""
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.run(main)
+    return uvloop.run(main)
+
+
 class TradeLauncher:
     """Trade launcher for managing different execution modes and component initialization."""
 
@@ -75,7 +84,7 @@ class TradeLauncher:
                 traceback.print_exc()
 
         try:
-            asyncio.run(run_component_test())
+            run_event_loop(run_component_test())
         except KeyboardInterrupt:
             print("\nShutdown complete")
 
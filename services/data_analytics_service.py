@@ -31,7 +31,7 @@ class DataAnalyticsService(AbstractService):
 
     def __init__(self, config: Dict[str, Any]):
         super().__init__("data_analytics", config)
-        self.message_bus = MessageBus("data_analytics")
+        self.message_bus = MessageBus("data_analytics", config.get("message_bus"))
 
         # Analytics configuration
         analytics_config = config.get("analytics", {})
@@ -73,8 +73,7 @@ class DataAnalyticsService(AbstractService):
             )
 
             # Main service loop - most work is done in event handlers
-            while self._running:
-                await asyncio.sleep(1)
+            await self._shutdown_event.wait()
 
         except Exception as e:
             self.logger.error(f"DataAnalytics service error: {e}")
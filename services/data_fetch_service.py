@@ -15,7 +15,7 @@ class DataFetchService(AbstractService):
 
     def __init__(self, config: Dict[str, Any]):
         super().__init__("data_fetch", config)
-        self.message_bus = MessageBus("data_fetch")
+        self.message_bus = MessageBus("data_fetch", config.get("message_bus"))
         self.fetch_interval = config.framework.fetch_interval_minutes
 
     async def initialize(self):
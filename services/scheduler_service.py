@@ -6,6 +6,7 @@ In backtest mode: Waits for DATA_PROCESSED events to trigger next step
 """
 
 import asyncio
+import time
 from typing import Dict, Any, List, Type
 
 from core import AbstractService, MessageBus, Topics, Ports
@@ -22,7 +23,7 @@ class SchedulerService(AbstractService):
 
     def __init__(self, config: Dict[str, Any]):
         super().__init__("scheduler", config)
-        self.message_bus = MessageBus("scheduler")
+        self.message_bus = MessageBus("scheduler", config.get("message_bus"))
 
         # Configuration
         self.mode = config.get("mode", "live")
@@ -120,14 +121,13 @@ class SchedulerService(AbstractService):
 
         # In backtest mode, we just keep the service alive
         # Step triggering is handled by _handle_data_processed
-        while self._running:
-            await asyncio.sleep(1)
+        await self._shutdown_event.wait()
 
     async def _publish_global_step(self):
         """Publish a GLOBAL_STEP event to coordinate strategy execution."""
         step_data = {
             "step_number": self.current_step,
-            "timestamp": asyncio.get_event_loop().time(),
+            "timestamp": time.monotonic(),
             "mode": self.mode,
         }
 
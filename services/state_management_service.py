@@ -7,12 +7,27 @@ Uses DuckDB for durable storage with JSON serialization.
 
 import asyncio
 import json
-from typing import Dict, Any, Optional
+import re
+from typing import Dict, Any, List, Optional, Tuple
 import duckdb
 
 from core import AbstractService, MessageBus, Ports
 
 
+# Queued by cleanup(): the writer commits everything ahead of it, then exits
+_STOP_WRITER = object()
+
+# duckdb_memory_limit is interpolated into a PRAGMA, so only plain sizes
+# such as "4GB", "512 MiB" or "1.5GB" are accepted
+_MEMORY_LIMIT_RE = re.compile(r"^\d+(\.\d+)?\s*[KMGT]?i?B$", re.IGNORECASE)
+
+# (table, sequence) pairs backing the id column defaults
+_ID_SEQUENCES = (
+    ("strategy_states", "strategy_states_id_seq"),
+    ("state_history", "state_history_id_seq"),
+)
+
+
 class StateManagementService(AbstractService):
     """
     Service for managing strategy state persistence.
@@ -26,14 +41,25 @@ class StateManagementService(AbstractService):
     
     def __init__(self, config: Dict[str, Any]):
         super().__init__("state_management", config)
-        self.message_bus = StateManagementMessageBus("state_management")
+        self.message_bus = StateManagementMessageBus("state_management", config.get("message_bus"))
         
         # Configuration
         self.db_path = config.get('duckdb_path', 'data/states.db')
         self.max_state_versions = config.get('max_state_versions_per_strategy', 10)
+        self.db_threads = config.get('duckdb_threads', 4)
+        self.db_memory_limit = str(config.get('duckdb_memory_limit', '4GB'))
+        if not _MEMORY_LIMIT_RE.match(self.db_memory_limit):
+            raise ValueError(f"Invalid duckdb_memory_limit: {self.db_memory_limit!r}")
+        self.write_batch_rows = config.get('state_write_batch_rows', 1000)
         
         # Database connection
         self.db_conn: Optional[duckdb.DuckDBPyConnection] = None
+
+        # Writes are queued and committed by a single writer task, one
+        # transaction per drained batch, on its own cursor in a worker thread
+        self._writer_conn: Optional[duckdb.DuckDBPyConnection] = None
+        self._write_queue: asyncio.Queue = asyncio.Queue()
+        self._writer_task: Optional[asyncio.Task] = None
     
     async def initialize(self):
         """Initialize state management service and database."""
@@ -49,10 +75,26 @@ class StateManagementService(AbstractService):
         try:
             self.db_conn = duckdb.connect(self.db_path)
             
+            # State rows are looked up by strategy_id, never by scan order, so
+            # dropping insertion-order preservation speeds up bulk writes
+            self.db_conn.execute("PRAGMA preserve_insertion_order=false")
+            self.db_conn.execute(f"PRAGMA threads={int(self.db_threads)}")
+            self.db_conn.execute(f"PRAGMA memory_limit='{self.db_memory_limit}'")
+            
+            # Sequences start past any ids already present in a database
+            # created before the tables had an id default
+            for table, sequence in _ID_SEQUENCES:
+                start = 1
+                if self._table_exists(table):
+                    start = self.db_conn.execute(
+                        f"SELECT COALESCE(MAX(id), 0) + 1 FROM {table}"
+                    ).fetchone()[0]
+                self.db_conn.execute(f"CREATE SEQUENCE IF NOT EXISTS {sequence} START {start}")
+
             # Create strategy_states table
             self.db_conn.execute("""
                 CREATE TABLE IF NOT EXISTS strategy_states (
-                    id INTEGER PRIMARY KEY,
+                    id INTEGER PRIMARY KEY DEFAULT nextval('strategy_states_id_seq'),
                     strategy_id VARCHAR UNIQUE,
                     state_json TEXT,
                     version INTEGER DEFAULT 1,
@@ -63,7 +105,7 @@ class StateManagementService(AbstractService):
             # Create state_history table for versioning
             self.db_conn.execute("""
                 CREATE TABLE IF NOT EXISTS state_history (
-                    id INTEGER PRIMARY KEY,
+                    id INTEGER PRIMARY KEY DEFAULT nextval('state_history_id_seq'),
                     strategy_id VARCHAR,
                     state_json TEXT,
                     version INTEGER,
@@ -71,13 +113,28 @@ class StateManagementService(AbstractService):
                 )
             """)
             
+            # CREATE TABLE IF NOT EXISTS leaves older tables as they were;
+            # give their id columns the sequence default as well
+            for table, sequence in _ID_SEQUENCES:
+                self.db_conn.execute(
+                    f"ALTER TABLE {table} ALTER COLUMN id SET DEFAULT nextval('{sequence}')"
+                )
+            
             self.db_conn.commit()
+            self._writer_conn = self.db_conn.cursor()
+            self._writer_task = asyncio.create_task(self._state_writer_loop())
             self.logger.info(f"Initialized state database: {self.db_path}")
             
         except Exception as e:
             self.logger.error(f"Failed to initialize state database: {e}")
             raise
     
+    def _table_exists(self, table: str) -> bool:
+        return self.db_conn.execute(
+            "SELECT COUNT(*) FROM information_schema.tables WHERE table_name = ?",
+            (table,)
+        ).fetchone()[0] > 0
+    
     async def async_run(self):
         """Main state management service loop."""
         await self.initialize()
@@ -104,57 +161,98 @@ class StateManagementService(AbstractService):
         Returns:
             True if successful, False otherwise
         """
-        try:
-            state_json = json.dumps(state_dict)
-            current_time = asyncio.get_event_loop().time()
-            
-            # Check if strategy already has a state
-            existing = self.db_conn.execute(
-                "SELECT version FROM strategy_states WHERE strategy_id = ?",
-                (strategy_id,)
-            ).fetchone()
+        return await self.save_states([(strategy_id, state_dict)])
+    
+    async def save_states(self, items: List[Tuple[str, Dict[str, Any]]]) -> bool:
+        """
+        Queue a batch of strategy states for the writer task.
+        
+        Args:
+            items: (strategy_id, state_dict) pairs, written in order
             
-            if existing:
-                # Update existing state
-                new_version = existing[0] + 1
-                
-                # Archive current state to history
-                current_state = self.db_conn.execute(
-                    "SELECT state_json FROM strategy_states WHERE strategy_id = ?",
-                    (strategy_id,)
-                ).fetchone()
-                
-                if current_state:
-                    self.db_conn.execute("""
-                        INSERT INTO state_history (strategy_id, state_json, version)
-                        VALUES (?, ?, ?)
-                    """, (strategy_id, current_state[0], existing[0]))
-                
-                # Update main state
-                self.db_conn.execute("""
-                    UPDATE strategy_states 
-                    SET state_json = ?, version = ?, last_updated = CURRENT_TIMESTAMP
-                    WHERE strategy_id = ?
-                """, (state_json, new_version, strategy_id))
-                
-            else:
-                # Create new state record
-                self.db_conn.execute("""
-                    INSERT INTO strategy_states (strategy_id, state_json)
-                    VALUES (?, ?)
-                """, (strategy_id, state_json))
+        Returns:
+            True once the batch is committed, False if the write failed
+            or the writer is not running (before initialize/after cleanup)
+        """
+        if self._writer_task is None or self._writer_task.done():
+            self.logger.error(f"State writer is not running; dropped {len(items)} states")
+            return False
+        done = asyncio.get_running_loop().create_future()
+        self._write_queue.put_nowait((items, done))
+        return await done
+    
+    async def _state_writer_loop(self):
+        """Drain queued writes and commit them in a single transaction until stopped."""
+        stopping = False
+        while not stopping:
+            pending = []
+            entry = await self._write_queue.get()
+            while True:
+                if entry is _STOP_WRITER:
+                    stopping = True
+                    break
+                pending.append(entry)
+                if self._write_queue.empty():
+                    break
+                entry = self._write_queue.get_nowait()
+            if not pending:
+                continue
             
-            # Clean up old history versions if necessary
-            await self._cleanup_old_versions(strategy_id)
+            items = [item for batch, _ in pending for item in batch]
+            try:
+                await asyncio.to_thread(self._write_states, items)
+                success = True
+            except Exception as e:
+                self.logger.error(f"Failed to save {len(items)} states: {e}")
+                success = False
             
-            self.db_conn.commit()
-            self.logger.debug(f"Saved state for strategy {strategy_id}")
+            for _, done in pending:
+                if not done.done():
+                    done.set_result(success)
+    
+    def _write_states(self, items: List[Tuple[str, Dict[str, Any]]]):
+        """Write states in transactions of up to write_batch_rows (runs in a worker thread)."""
+        conn = self._writer_conn
+        for start in range(0, len(items), self.write_batch_rows):
+            conn.execute("BEGIN TRANSACTION")
+            try:
+                for strategy_id, state_dict in items[start:start + self.write_batch_rows]:
+                    self._write_state(conn, strategy_id, json.dumps(state_dict))
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+    
+    def _write_state(self, conn: duckdb.DuckDBPyConnection, strategy_id: str, state_json: str):
+        # Check if strategy already has a state
+        existing = conn.execute(
+            "SELECT version, state_json FROM strategy_states WHERE strategy_id = ?",
+            (strategy_id,)
+        ).fetchone()
+        
+        if existing:
+            # Archive current state to history
+            conn.execute("""
+                INSERT INTO state_history (strategy_id, state_json, version)
+                VALUES (?, ?, ?)
+            """, (strategy_id, existing[1], existing[0]))
             
-            return True
+            # Update main state
+            conn.execute("""
+                UPDATE strategy_states 
+                SET state_json = ?, version = ?, last_updated = CURRENT_TIMESTAMP
+                WHERE strategy_id = ?
+            """, (state_json, existing[0] + 1, strategy_id))
             
-        except Exception as e:
-            self.logger.error(f"Failed to save state for {strategy_id}: {e}")
-            return False
+        else:
+            # Create new state record
+            conn.execute("""
+                INSERT INTO strategy_states (strategy_id, state_json)
+                VALUES (?, ?)
+            """, (strategy_id, state_json))
+        
+        # Clean up old history versions if necessary
+        self._cleanup_old_versions(conn, strategy_id)
     
     async def load_state(self, strategy_id: str) -> Optional[Dict[str, Any]]:
         """
@@ -252,35 +350,47 @@ class StateManagementService(AbstractService):
             self.logger.error(f"Failed to list strategy states: {e}")
             return {}
     
-    async def _cleanup_old_versions(self, strategy_id: str):
+    def _cleanup_old_versions(self, conn: duckdb.DuckDBPyConnection, strategy_id: str):
         """Clean up old state versions to maintain storage limits."""
-        try:
-            # Count current versions
-            version_count = self.db_conn.execute(
-                "SELECT COUNT(*) FROM state_history WHERE strategy_id = ?",
-                (strategy_id,)
-            ).fetchone()[0]
-            
-            if version_count > self.max_state_versions:
-                # Delete oldest versions
-                versions_to_delete = version_count - self.max_state_versions
-                self.db_conn.execute("""
-                    DELETE FROM state_history 
-                    WHERE strategy_id = ? 
-                    ORDER BY saved_at ASC 
+        # Count current versions
+        version_count = conn.execute(
+            "SELECT COUNT(*) FROM state_history WHERE strategy_id = ?",
+            (strategy_id,)
+        ).fetchone()[0]
+        
+        if version_count > self.max_state_versions:
+            # Delete oldest versions
+            versions_to_delete = version_count - self.max_state_versions
+            conn.execute("""
+                DELETE FROM state_history
+                WHERE id IN (
+                    SELECT id FROM state_history
+                    WHERE strategy_id = ?
+                    ORDER BY version ASC
                     LIMIT ?
-                """, (strategy_id, versions_to_delete))
-                
-                self.logger.debug(f"Cleaned up {versions_to_delete} old versions for {strategy_id}")
-                
-        except Exception as e:
-            self.logger.error(f"Failed to cleanup old versions for {strategy_id}: {e}")
+                )
+            """, (strategy_id, versions_to_delete))
+            
+            self.logger.debug(f"Cleaned up {versions_to_delete} old versions for {strategy_id}")
     
     async def cleanup(self):
         """Clean up state management service resources."""
         await super().cleanup()
         await self.message_bus.cleanup()
         
+        # Never cancel the writer: its worker thread would keep using
+        # _writer_conn while the connection is closed. Ask it to commit what
+        # is queued and wait for it to exit instead
+        if self._writer_task and not self._writer_task.done():
+            self._write_queue.put_nowait(_STOP_WRITER)
+            await asyncio.gather(self._writer_task, return_exceptions=True)
+        
+        # Only left behind if the writer never started or died
+        while not self._write_queue.empty():
+            entry = self._write_queue.get_nowait()
+            if entry is not _STOP_WRITER and not entry[1].done():
+                entry[1].set_result(False)
+        
         if self.db_conn:
             self.db_conn.close()
             self.logger.info("Closed state database connection")
@@ -295,8 +405,8 @@ class StateManagementMessageBus(MessageBus):
     Handles REQ/REP pattern for state operations.
     """
     
-    def __init__(self, service_name: str):
-        super().__init__(service_name)
+    def __init__(self, service_name: str, config: Optional[Dict[str, Any]] = None):
+        super().__init__(service_name, config)
         self.state_service: Optional[StateManagementService] = None
     
     def set_state_service(self, service: StateManagementService):
@@ -309,6 +419,7 @@ class StateManagementMessageBus(MessageBus):
         
         Supported operations:
         - save_state: Save strategy state
+        - save_states: Save a batch of strategy states in one transaction
         - load_state: Load strategy state
         - load_state_version: Load specific state version
         - list_states: List all strategy states
@@ -330,6 +441,17 @@ class StateManagementMessageBus(MessageBus):
                 success = await self.state_service.save_state(strategy_id, state_dict)
                 return {'success': success}
             
+            elif operation == 'save_states':
+                batch = params.get('batch', [])
+                
+                if not batch or any(not item.get('strategy_id') for item in batch):
+                    return {'error': 'batch of items with strategy_id is required for save_states'}
+                
+                success = await self.state_service.save_states(
+                    [(item['strategy_id'], item.get('state_dict', {})) for item in batch]
+                )
+                return {'success': success}
+            
             elif operation == 'load_state':
                 strategy_id = params.get('strategy_id')
                 
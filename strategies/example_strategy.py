@@ -8,7 +8,7 @@ Demonstrates how to:
 4. Handle state persistence and recovery
 """
 
-import asyncio
+import time
 from typing import Dict, Any
 
 from core import AbstractStrategy
@@ -60,7 +60,7 @@ class ExampleTradingStrategy(AbstractStrategy):
         """
         await super().step()  # Call parent for logging and state saving
         
-        current_time = asyncio.get_event_loop().time()
+        current_time = time.monotonic()
         self.logger.info(f"Executing step for {self.strategy_id} at time {current_time}")
         
         try:
@@ -105,7 +105,7 @@ class ExampleTradingStrategy(AbstractStrategy):
             print(f"  Total trades: {self.state['total_trades']}")
             
             # Update last analysis time
-            self.state['last_analysis_time'] = asyncio.get_event_loop().time()
+            self.state['last_analysis_time'] = time.monotonic()
             
         except Exception as e:
             self.logger.error(f"Portfolio analysis error: {e}")
@@ -250,11 +250,11 @@ class ExampleTradingStrategy(AbstractStrategy):
                     print(f"[PLACEHOLDER] Reviewing strategy {self.strategy_id}")
                 
                 # Update state to reflect changes
-                self.state['last_reflection_update'] = asyncio.get_event_loop().time()
+                self.state['last_reflection_update'] = time.monotonic()
                 self.state['last_adjustment'] = {
                     'action': action,
                     'reason': reason,
-                    'timestamp': asyncio.get_event_loop().time()
+                    'timestamp': time.monotonic()
                 }
                 
         except Exception as e:
@@ -5,7 +5,7 @@ Runs independently with its own scheduling to provide
 real-time market insights to strategies.
 """
 
-import asyncio
+import time
 from typing import Dict, Any
 
 from core import AbstractTask
@@ -55,7 +55,7 @@ class MarketAnalysisTask(AbstractTask):
             
             result = {
                 'task_type': 'market_analysis',
-                'timestamp': asyncio.get_event_loop().time(),
+                'timestamp': time.monotonic(),
                 'symbols_analyzed': len(self.symbols),
                 'symbol_results': analysis_results,
                 'market_summary': market_summary,
@@ -70,7 +70,7 @@ class MarketAnalysisTask(AbstractTask):
             return {
                 'task_type': 'market_analysis',
                 'error': str(e),
-                'timestamp': asyncio.get_event_loop().time()
+                'timestamp': time.monotonic()
             }
     
     async def _analyze_symbol(self, symbol: str) -> Dict[str, Any]:
@@ -6,6 +6,7 @@ with independent scheduling for order management.
 """
 
 import asyncio
+import time
 from typing import Dict, Any
 
 from core import AbstractTask
@@ -56,7 +57,7 @@ class OrderExecutionTask(AbstractTask):
         """
         try:
             self.logger.info(f"Starting order execution: {self.task_id}")
-            self.execution_start_time = asyncio.get_event_loop().time()
+            self.execution_start_time = time.monotonic()
             
             # Execute the order
             result = await self.execute()
@@ -69,6 +70,8 @@ class OrderExecutionTask(AbstractTask):
         except Exception as e:
             self.logger.error(f"Order execution task error: {e}")
             await self.send_error(str(e))
+        finally:
+            await self.close()
     
     async def execute(self) -> Dict[str, Any]:
         """
@@ -119,7 +122,7 @@ class OrderExecutionTask(AbstractTask):
                 'filled_size': self.filled_size,
                 'avg_fill_price': self.avg_fill_price,
                 'order_id': self.order_id,
-                'execution_time': asyncio.get_event_loop().time() - self.execution_start_time,
+                'execution_time': time.monotonic() - self.execution_start_time,
                 'metrics': metrics,
                 'signal_confidence': self.signal_confidence
             }
@@ -222,7 +225,7 @@ class OrderExecutionTask(AbstractTask):
             # 5. Store order ID
             
             # Mock order placement
-            mock_order_id = f"ORDER_{self.symbol}_{asyncio.get_event_loop().time()}"
+            mock_order_id = f"ORDER_{self.symbol}_{time.monotonic()}"
             
             # Simulate order placement latency
             await asyncio.sleep(0.1)
@@ -234,14 +237,14 @@ class OrderExecutionTask(AbstractTask):
                     'success': True,
                     'order_id': mock_order_id,
                     'status': 'placed',
-                    'timestamp': asyncio.get_event_loop().time()
+                    'timestamp': time.monotonic()
                 }
                 print(f"[PLACEHOLDER] Placed order {mock_order_id}: {self.action} {self.size} {self.symbol}")
             else:
                 result = {
                     'success': False,
                     'error': 'Order placement failed - insufficient liquidity',
-                    'timestamp': asyncio.get_event_loop().time()
+                    'timestamp': time.monotonic()
                 }
                 print(f"[PLACEHOLDER] Order placement failed for {self.symbol}")
             
@@ -262,10 +265,10 @@ class OrderExecutionTask(AbstractTask):
             Final execution status and details
         """
         try:
-            start_time = asyncio.get_event_loop().time()
+            start_time = time.monotonic()
             check_interval = 1.0  # Check every second
             
-            while (asyncio.get_event_loop().time() - start_time) < self.timeout_seconds:
+            while (time.monotonic() - start_time) < self.timeout_seconds:
                 # TODO: Check order status with exchange API
                 # In real implementation:
                 # 1. Query order status
@@ -277,7 +280,7 @@ class OrderExecutionTask(AbstractTask):
                 await asyncio.sleep(check_interval)
                 
                 # Simulate progressive fill
-                elapsed = asyncio.get_event_loop().time() - start_time
+                elapsed = time.monotonic() - start_time
                 fill_progress = min(elapsed / 10.0, 1.0)  # Complete in 10 seconds
                 
                 self.filled_size = int(self.size * fill_progress)
@@ -306,7 +309,7 @@ class OrderExecutionTask(AbstractTask):
                 'final_status': self.order_status,
                 'filled_size': self.filled_size,
                 'avg_fill_price': self.avg_fill_price,
-                'execution_time': asyncio.get_event_loop().time() - start_time
+                'execution_time': time.monotonic() - start_time
             }
             
             self.logger.info(f"Order monitoring completed: {self.order_status}")
@@ -346,7 +349,7 @@ class OrderExecutionTask(AbstractTask):
                 metrics['slippage_bps'] = slippage * 10000  # Basis points
                 
                 # Execution speed
-                execution_time = asyncio.get_event_loop().time() - self.execution_start_time
+                execution_time = time.monotonic() - self.execution_start_time
                 metrics['execution_time'] = execution_time
                 
                 # Execution quality score (0-100)
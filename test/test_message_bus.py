@@ -0,0 +1,281 @@
+"""
+MessageBus 行为测试：序列化互通、DEALER/ROUTER 请求、批量发布/推送、XPUB 跳过。
+"""
+
+import asyncio
+import time
+
+import pytest
+import zmq.asyncio
+
+from core import AbstractTask, Ports
+from core.message_bus import JsonSerializer, MessageBus, build_serializer
+from utils.log_utils import LogUtils
+
+# 总线使用全局 LogUtils 单例；测试中不写日志文件，也不输出到控制台
+LogUtils({"log_service": {"file_output": False, "console_output": False}})
+
+
+NON_FINITE = {
+    "sma": float("nan"),
+    "bounds": [1.5, float("inf"), (2, -float("inf"))],
+    1: {"ema": float("nan")},
+}
+
+
+def test_json_writes_non_finite_floats_as_null():
+    assert JsonSerializer().dumps(NON_FINITE) == (
+        b'{"sma":null,"bounds":[1.5,null,[2,null]],"1":{"ema":null}}'
+    )
+
+
+def test_json_and_orjson_interoperate_on_non_finite_floats():
+    orjson_serializer = build_serializer("orjson")
+    if isinstance(orjson_serializer, JsonSerializer):
+        pytest.skip("orjson not installed")
+    json_serializer = JsonSerializer()
+
+    assert json_serializer.dumps(NON_FINITE) == orjson_serializer.dumps(NON_FINITE)
+    decoded = orjson_serializer.loads(json_serializer.dumps(NON_FINITE))
+    assert decoded["sma"] is None and decoded["bounds"] == [1.5, None, [2, None]]
+
+
+def test_json_keeps_finite_floats():
+    serializer = JsonSerializer()
+    assert serializer.loads(serializer.dumps({"x": 0.1, "y": [1e308]})) == {"x": 0.1, "y": [1e308]}
+
+
+# ---------- 端到端（inproc，不占用 TCP 端口）----------
+
+INPROC = {"transport": "inproc"}
+
+
+class EchoServer(MessageBus):
+    """按请求里的 delay 延迟后原样回复。"""
+
+    async def _handle_request(self, request):
+        data = request["data"]
+        await asyncio.sleep(data.get("delay", 0))
+        if data.get("unserializable"):
+            return {"echo": object()}
+        return {"echo": data["n"]}
+
+
+class Collector(MessageBus):
+    def __init__(self, name, config=INPROC):
+        super().__init__(name, config)
+        self.pulled = []
+
+    async def _handle_pulled_message(self, message):
+        self.pulled.append(message)
+
+
+async def _until(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "condition not reached"
+        await asyncio.sleep(0.01)
+
+
+class Subscriber:
+    """订阅端 handler：记录业务消息，探测消息只用来确认订阅已生效。"""
+
+    def __init__(self):
+        self.received = []
+        self.probed = False
+
+    async def on_message(self, message):
+        if isinstance(message["data"], dict) and message["data"].get("probe"):
+            self.probed = True
+        else:
+            self.received.append(message)
+
+
+async def _wait_subscribed(pub: MessageBus, sub: Subscriber, port: int, topic: str):
+    """订阅生效前 XPUB 会跳过发布：反复发布探测消息，直到订阅端收到一条。"""
+    deadline = time.monotonic() + 2.0
+    while not sub.probed:
+        assert time.monotonic() < deadline, "subscription not established"
+        await pub.publish(topic, {"probe": True}, port)
+        await asyncio.sleep(0.01)
+
+
+def test_concurrent_requests_are_matched_to_their_replies():
+    async def scenario():
+        server, client = EchoServer("server", INPROC), MessageBus("client", INPROC)
+        loop_task = asyncio.create_task(server.response_loop(7101))
+        try:
+            started = time.monotonic()
+            replies = await asyncio.gather(
+                *(client.request({"n": n, "delay": 0.3 - 0.1 * n}, 7101) for n in range(3))
+            )
+            return replies, time.monotonic() - started
+        finally:
+            loop_task.cancel()
+            await client.cleanup()
+            await server.cleanup()
+
+    replies, elapsed = asyncio.run(scenario())
+    assert [r["echo"] for r in replies] == [0, 1, 2]
+    # 并发处理：总耗时接近最慢的一次，而不是三次之和
+    assert elapsed < 0.5
+
+
+def test_timed_out_request_drops_late_reply():
+    async def scenario():
+        server, client = EchoServer("server", INPROC), MessageBus("client", INPROC)
+        loop_task = asyncio.create_task(server.response_loop(7102))
+        try:
+            timed_out = await client.request({"n": 1, "delay": 0.3}, 7102, timeout=0.2)
+            await asyncio.sleep(0.3)  # 迟到的回复在此期间到达
+            next_reply = await client.request({"n": 2}, 7102)
+            return timed_out, next_reply, client.get_metrics()
+        finally:
+            loop_task.cancel()
+            await client.cleanup()
+            await server.cleanup()
+
+    timed_out, next_reply, metrics = asyncio.run(scenario())
+    assert timed_out is None
+    assert next_reply == {"echo": 2}
+    assert metrics["request_timeouts"] == 1
+    assert metrics["inbound_dropped"] == 1
+
+
+def test_unserializable_reply_is_returned_as_error():
+    async def scenario():
+        server, client = EchoServer("server", INPROC), MessageBus("client", INPROC)
+        loop_task = asyncio.create_task(server.response_loop(7108))
+        try:
+            reply = await client.request({"n": 1, "unserializable": True}, 7108, timeout=2)
+            return reply, server.get_metrics()
+        finally:
+            loop_task.cancel()
+            await client.cleanup()
+            await server.cleanup()
+
+    reply, metrics = asyncio.run(scenario())
+    assert reply["error"].startswith("Serialize error:")
+    assert metrics["errors"] == 1
+
+
+def test_publish_batch_is_delivered_item_by_item():
+    async def scenario():
+        pub, sub = MessageBus("pub", INPROC), MessageBus("sub", INPROC)
+        handler = Subscriber()
+        sub.register_handler("ticks", handler.on_message)
+        loop_task = asyncio.create_task(sub.subscribe_loop(7103, ["ticks"]))
+        try:
+            await _wait_subscribed(pub, handler, 7103, "ticks")
+            sent_before = pub.get_metrics()["messages_sent"]
+            await pub.publish_batch("ticks", [{"n": 1}, {"n": 2}, {"n": 3}], 7103)
+            await pub.publish("ticks", {"n": 4, "batch": "not a marker"}, 7103)
+            await _until(lambda: len(handler.received) == 4)
+            return [m["data"] for m in handler.received], pub.get_metrics()["messages_sent"] - sent_before
+        finally:
+            loop_task.cancel()
+            await pub.cleanup()
+            await sub.cleanup()
+
+    received, frames_sent = asyncio.run(scenario())
+    assert received == [{"n": 1}, {"n": 2}, {"n": 3}, {"n": 4, "batch": "not a marker"}]
+    assert frames_sent == 2
+
+
+def test_publish_skips_topics_without_subscribers():
+    async def scenario():
+        pub, sub = MessageBus("pub", INPROC), MessageBus("sub", INPROC)
+        handler = Subscriber()
+        sub.register_handler("wanted", handler.on_message)
+        loop_task = asyncio.create_task(sub.subscribe_loop(7104, ["wanted"]))
+        try:
+            await _wait_subscribed(pub, handler, 7104, "wanted")
+            before = pub.get_metrics()
+            await pub.publish("unwanted", {"n": 1}, 7104)
+            await pub.publish("wanted", {"n": 2}, 7104)
+            await _until(lambda: handler.received)
+            after = pub.get_metrics()
+            return (
+                [m["topic"] for m in handler.received],
+                after["publish_skipped"] - before["publish_skipped"],
+                after["messages_sent"] - before["messages_sent"],
+            )
+        finally:
+            loop_task.cancel()
+            await pub.cleanup()
+            await sub.cleanup()
+
+    received, skipped, sent = asyncio.run(scenario())
+    assert received == ["wanted"]
+    assert skipped == 1
+    assert sent == 1
+
+
+def test_push_batches_use_envelope_markers_and_bad_frames_do_not_stop_pull_loop():
+    async def scenario():
+        puller, pusher = Collector("puller"), MessageBus("pusher", INPROC)
+        loop_task = asyncio.create_task(puller.pull_results_loop(7105))
+        await asyncio.sleep(0.05)
+        try:
+            # data 中与批量标记同名的字段原样送达
+            await pusher.push_result({"rows": [[1, 2], [3, 4]], "table": "ohlc"}, 7105)
+            await pusher.push_result({"batch": ["a"], "job": "x"}, 7105)
+            await pusher._send_push(7105, "rows", [[1, 2]])  # 行格式错误，只丢弃这一帧
+            await pusher.push_batch([{"n": 1}, {"n": 2}], 7105)
+            await pusher.push_rows([["t1", 0.5, "result", {"n": 3}]], 7105, strategy_id="s1")
+            await _until(lambda: len(puller.pulled) == 5)
+            return [m["data"] for m in puller.pulled], puller.get_metrics(), loop_task.done()
+        finally:
+            loop_task.cancel()
+            await pusher.cleanup()
+            await puller.cleanup()
+
+    data, metrics, loop_done = asyncio.run(scenario())
+    assert data == [
+        {"rows": [[1, 2], [3, 4]], "table": "ohlc"},
+        {"batch": ["a"], "job": "x"},
+        {"n": 1},
+        {"n": 2},
+        {"task_id": "t1", "strategy_id": "s1", "timestamp": 0.5, "result": {"n": 3}},
+    ]
+    assert metrics["inbound_dropped"] == 1
+    assert not loop_done
+
+
+class OneShotTask(AbstractTask):
+    async def execute(self):
+        return {}
+
+
+def test_task_close_delivers_batch_held_by_flusher():
+    async def scenario():
+        # 任务的私有总线取 config 的 message_bus 段；inproc 端点只在本进程内可见，
+        # 不会占用（或撞上运行中系统的）TCP 端口
+        puller = Collector("puller")
+        loop_task = asyncio.create_task(puller.pull_results_loop(Ports.TASK_RESULTS))
+        await asyncio.sleep(0.05)
+        try:
+            task = OneShotTask("s1", {}, {"message_bus": INPROC})
+            await task.send_result({"n": 1})
+            await asyncio.sleep(0.001)  # flusher 已取走第一条，正在等待 result_batch_wait
+            await task.send_result({"n": 2})
+            await task.close()
+            await _until(lambda: len(puller.pulled) == 2)
+            return [m["data"]["result"] for m in puller.pulled]
+        finally:
+            loop_task.cancel()
+            await puller.cleanup()
+
+    assert asyncio.run(scenario()) == [{"n": 1}, {"n": 2}]
+
+
+def test_cleanup_never_terms_the_global_context_instance():
+    async def scenario():
+        outside = MessageBus("outside", INPROC, context=zmq.asyncio.Context.instance())
+        await outside.push_result({"n": 1}, 7106)  # 在全局 Context 上留一个打开的 socket
+        bus = MessageBus("bus", INPROC)
+        await bus.push_result({"n": 1}, 7107)
+        await asyncio.wait_for(bus.cleanup(), timeout=2)
+        await outside.cleanup()
+
+    asyncio.run(scenario())
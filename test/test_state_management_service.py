@@ -0,0 +1,103 @@
+"""
+StateManagementService 批量写入测试：提交结果、逐请求 future、停止时排空队列。
+"""
+
+import asyncio
+import logging
+
+import duckdb
+import pytest
+
+from services.state_management_service import StateManagementService
+from utils.log_utils import LogUtils
+
+# 总线使用全局 LogUtils 单例；测试中不写日志文件，也不输出到控制台
+LogUtils({"log_service": {"file_output": False, "console_output": False}})
+
+
+async def _start_service(db_path) -> StateManagementService:
+    service = StateManagementService({"duckdb_path": str(db_path), "max_state_versions_per_strategy": 2})
+    service.logger = logging.getLogger("test_state_management")
+    await service._initialize_database()
+    return service
+
+
+def _rows(db_path, sql):
+    conn = duckdb.connect(str(db_path))
+    try:
+        return conn.execute(sql).fetchall()
+    finally:
+        conn.close()
+
+
+def test_concurrent_saves_are_committed_and_resolve_true(tmp_path):
+    db_path = tmp_path / "states.db"
+
+    async def scenario():
+        service = await _start_service(db_path)
+        results = await asyncio.gather(
+            *(service.save_state(f"s{i % 2}", {"step": i}) for i in range(6)),
+            service.save_states([("s2", {"step": 0}), ("s2", {"step": 1})]),
+        )
+        await service.cleanup()
+        return results
+
+    assert asyncio.run(scenario()) == [True] * 7
+    assert _rows(db_path, "SELECT strategy_id, version, state_json FROM strategy_states ORDER BY 1") == [
+        ("s0", 3, '{"step": 4}'),
+        ("s1", 3, '{"step": 5}'),
+        ("s2", 2, '{"step": 1}'),
+    ]
+    # 每个策略最多保留 max_state_versions_per_strategy 条历史
+    assert _rows(db_path, "SELECT strategy_id, COUNT(*) FROM state_history GROUP BY 1 ORDER BY 1") == [
+        ("s0", 2),
+        ("s1", 2),
+        ("s2", 1),
+    ]
+
+
+def test_failed_batch_resolves_false_and_rolls_back(tmp_path):
+    db_path = tmp_path / "states.db"
+
+    async def scenario():
+        service = await _start_service(db_path)
+        failed = await service.save_states([("ok", {"n": 1}), ("bad", {"n": object()})])
+        saved = await service.save_state("ok", {"n": 2})
+        await service.cleanup()
+        return failed, saved
+
+    assert asyncio.run(scenario()) == (False, True)
+    assert _rows(db_path, "SELECT strategy_id, version FROM strategy_states") == [("ok", 1)]
+
+
+def test_cleanup_drains_queued_writes_before_closing(tmp_path):
+    db_path = tmp_path / "states.db"
+
+    async def scenario():
+        service = await _start_service(db_path)
+        pending = [asyncio.create_task(service.save_state(f"s{i}", {"n": i})) for i in range(20)]
+        await asyncio.sleep(0)  # 全部入队；写入任务此时最多取走了第一批
+        await service.cleanup()
+        late = await service.save_state("late", {"n": 0})
+        return [p.result() for p in pending], late
+
+    results, late = asyncio.run(scenario())
+    assert results == [True] * 20
+    # 停止后不再等待 future，直接返回 False
+    assert late is False
+    assert _rows(db_path, "SELECT COUNT(*) FROM strategy_states") == [(20,)]
+
+
+def test_save_before_initialize_returns_false(tmp_path):
+    async def scenario():
+        service = StateManagementService({"duckdb_path": str(tmp_path / "states.db")})
+        service.logger = logging.getLogger("test_state_management")
+        return await asyncio.wait_for(service.save_state("s", {}), timeout=1)
+
+    assert asyncio.run(scenario()) is False
+
+
+@pytest.mark.parametrize("limit", ["4GB'; DROP TABLE strategy_states; --", "lots", "4"])
+def test_rejects_memory_limit_that_is_not_a_size(limit):
+    with pytest.raises(ValueError):
+        StateManagementService({"duckdb_memory_limit": limit})
@@ -0,0 +1,119 @@
+"""
+PriorityTaskScheduler 行为测试：优先级顺序、老化、分组并发上限。
+"""
+
+import asyncio
+
+from core.constants import TaskPriority
+from core.task_scheduler import PriorityTaskScheduler, get_task_scheduler
+
+
+class RecordingTask:
+    """记录启动顺序；release 前一直占用并发名额。"""
+
+    def __init__(self, name: str, started: list, release: asyncio.Event = None):
+        self.name = name
+        self.started = started
+        self.release = release
+
+    async def run(self):
+        self.started.append(self.name)
+        if self.release is not None:
+            await self.release.wait()
+
+
+async def _settle():
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+
+def test_dispatches_by_priority_then_submission_order():
+    async def scenario():
+        scheduler = PriorityTaskScheduler(max_concurrency_per_group=1, aging_interval=0)
+        started = []
+        for name, priority in [
+            ("low", TaskPriority.LOW),
+            ("high", TaskPriority.HIGH),
+            ("normal_1", TaskPriority.NORMAL),
+            ("normal_2", TaskPriority.NORMAL),
+        ]:
+            scheduler.submit(RecordingTask(name, started), priority=priority, group="s")
+        await _settle()
+        return started
+
+    assert asyncio.run(scenario()) == ["high", "normal_1", "normal_2", "low"]
+
+
+def test_aged_low_priority_task_overtakes_new_high_priority_task():
+    async def scenario():
+        scheduler = PriorityTaskScheduler(max_concurrency_per_group=1, aging_interval=1.0)
+        started = []
+        release = asyncio.Event()
+        scheduler.submit(RecordingTask("blocker", started, release), group="s")
+        await _settle()
+
+        scheduler.submit(RecordingTask("old_low", started), priority=TaskPriority.LOW, group="s")
+        # 模拟已等待 11 个老化周期：10 - 11 = -1，低于 HIGH(0)
+        scheduler._waiting[-1].enqueued_at -= 11
+        scheduler.submit(RecordingTask("new_high", started), priority=TaskPriority.HIGH, group="s")
+
+        release.set()
+        await _settle()
+        return started
+
+    assert asyncio.run(scenario()) == ["blocker", "old_low", "new_high"]
+
+
+def test_group_cap_does_not_block_other_groups():
+    async def scenario():
+        scheduler = PriorityTaskScheduler(max_concurrency_per_group=2, aging_interval=0)
+        started = []
+        release = asyncio.Event()
+        for i in range(4):
+            scheduler.submit(RecordingTask(f"a{i}", started, release), group="a")
+        scheduler.submit(RecordingTask("b0", started, release), group="b")
+        scheduler.submit(RecordingTask("heavy", started, release), group="c", weight=5)
+        await _settle()
+        busy = scheduler.stats()
+
+        release.set()
+        await _settle()
+        return busy, scheduler.stats(), started
+
+    busy, idle, started = asyncio.run(scenario())
+    # weight 超过上限时按上限计
+    assert busy == {"waiting": 2, "running": 4, "in_use": {"a": 2, "b": 1, "c": 2}}
+    assert idle == {"waiting": 0, "running": 0, "in_use": {"a": 0, "b": 0, "c": 0}}
+    assert sorted(started) == ["a0", "a1", "a2", "a3", "b0", "heavy"]
+
+
+def test_cancel_group_drops_waiting_and_cancels_running():
+    async def scenario():
+        scheduler = PriorityTaskScheduler(max_concurrency_per_group=1, aging_interval=0)
+        started = []
+        release = asyncio.Event()
+        scheduler.submit(RecordingTask("running", started, release), group="s")
+        scheduler.submit(RecordingTask("waiting", started), group="s")
+        await _settle()
+        await scheduler.cancel_group("s")
+        await _settle()
+        return scheduler.stats(), started
+
+    stats, started = asyncio.run(scenario())
+    assert stats["waiting"] == 0 and stats["running"] == 0
+    assert started == ["running"]
+
+
+def test_each_event_loop_gets_its_own_scheduler():
+    async def scenario():
+        scheduler = get_task_scheduler({"task_max_concurrency_per_group": 1})
+        started = []
+        for i in range(3):
+            scheduler.submit(RecordingTask(str(i), started), group="s")
+        await _settle()
+        return scheduler, started
+
+    first, started_first = asyncio.run(scenario())
+    second, started_second = asyncio.run(scenario())
+    assert first is not second
+    assert started_first == started_second == ["0", "1", "2"]
@@ -2,20 +2,65 @@
 Log utilities: Centralized logging and console output management
 
 Features:
-- File-based logging with rotation
+- File-based logging with rotation, written by a background listener thread
 - Real-time console output via background thread
 - Singleton pattern for global access
 """
 
 import asyncio
+import atexit
 import threading
 import logging
 import os
-from datetime import datetime
+import time
 from typing import Dict, Any, Set, Optional
-from queue import Queue, Empty
+from queue import Queue, SimpleQueue, Empty
 import sys
-from logging.handlers import RotatingFileHandler
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
+
+
+class CachedTimeFormatter(logging.Formatter):
+    """
+    Formatter that renders the asctime date/time prefix once per second.
+
+    Only the millisecond suffix is formatted per record; the cache is a
+    single tuple so concurrent readers never see a torn update.
+    """
+
+    def __init__(self, fmt: str = None, datefmt: str = None):
+        super().__init__(fmt, datefmt)
+        self._second_cache = (None, "")
+
+    def formatTime(self, record, datefmt=None):
+        if datefmt:
+            return super().formatTime(record, datefmt)
+        second = int(record.created)
+        cached = self._second_cache
+        if cached[0] != second:
+            cached = (second, time.strftime(self.default_time_format, self.converter(second)))
+            self._second_cache = cached
+        return f"{cached[1]},{int(record.msecs):03d}"
+
+
+class LogUtilsHandler(logging.Handler):
+    """
+    Forward standard logging records into LogUtils.
+
+    The record's task_id (set by the shared task LoggerAdapter) is used as
+    the source name, falling back to the logger name.
+    """
+
+    def __init__(self, log_utils: "LogUtils"):
+        super().__init__()
+        self._log_utils = log_utils
+
+    def emit(self, record):
+        try:
+            source = getattr(record, "task_id", record.name)
+            self._log_utils.log_message(source, record.levelname, record.getMessage())
+        except Exception:
+            self.handleError(record)
+
 
 class LogUtils:
     """
@@ -48,20 +93,36 @@ class LogUtils:
         self.file_output = log_config.get("file_output", True)
         self.max_file_size = log_config.get("max_file_size_mb", 10) * 1024 * 1024
         self.backup_count = log_config.get("backup_count", 5)
+        self.task_log_level = log_config.get("task_log_level", "INFO")
 
         # Thread-safe queue for log messages
         self.log_queue = Queue()
+        self._console_time_cache = (None, "")
         self.console_thread = None
         self.thread_running = False
 
         # Single file logger
         self.file_logger: Optional[logging.Logger] = None
+        self.file_listener: Optional[QueueListener] = None
         self._setup_file_logger()
 
+        # Route the shared "task" logger through this service. log_message
+        # does no level filtering, so the logger level decides what reaches
+        # console and file (task debug output stays off unless configured)
+        task_logger = logging.getLogger("task")
+        task_logger.setLevel(self.task_log_level.upper())
+        task_logger.propagate = False
+        task_logger.addHandler(LogUtilsHandler(self))
+
         self._initialized = True
 
     def _setup_file_logger(self):
-        """Setup single file logger."""
+        """
+        Setup single file logger.
+
+        Log calls only enqueue records; a QueueListener thread owns the
+        RotatingFileHandler so disk writes never block the event loop.
+        """
         if not self.file_output:
             return
 
@@ -80,9 +141,20 @@ class LogUtils:
             backupCount=self.backup_count,
         )
 
-        formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
+        formatter = CachedTimeFormatter("%(asctime)s - %(levelname)s - %(message)s")
         handler.setFormatter(formatter)
-        self.file_logger.addHandler(handler)
+
+        file_queue = SimpleQueue()
+        self.file_logger.addHandler(QueueHandler(file_queue))
+        self.file_listener = QueueListener(file_queue, handler)
+        self.file_listener.start()
+        atexit.register(self._stop_file_listener)
+
+    def _stop_file_listener(self):
+        """Flush queued records to disk and stop the writer thread."""
+        if self.file_listener is not None:
+            self.file_listener.stop()
+            self.file_listener = None
 
     async def initialize(self):
         """Initialize log utils"""
@@ -119,7 +191,12 @@ class LogUtils:
             level: Log level (INFO, DEBUG, ERROR, etc.)
             message: The log message
         """
-        timestamp = datetime.now().strftime("%H:%M:%S")
+        second = int(time.time())
+        cached = self._console_time_cache
+        if cached[0] != second:
+            cached = (second, time.strftime("%H:%M:%S", time.localtime(second)))
+            self._console_time_cache = cached
+        timestamp = cached[1]
         formatted_message = f"[{timestamp}] {service_name}: {message}"
 
         # Console output
@@ -155,6 +232,8 @@ class LogUtils:
             except Empty:
                 break
 
+        self._stop_file_listener()
+
 
 
 # Global singleton instance